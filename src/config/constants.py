@@ -6,3 +6,6 @@ DEFAULT_CHUNK_SIZE = 512
 DEFAULT_CHUNK_OVERLAP = 64
 DEFAULT_MAX_CONTEXT_CHUNKS = 3
 
+# Model behind ChromaDB's default embedding function
+CHROMA_DEFAULT_EMBEDDING_MODEL = "chroma/all-MiniLM-L6-v2"
+
@@ -22,12 +22,32 @@ class Settings(BaseSettings):
     CHUNK_OVERLAP: int = 200
     MAX_CONTEXT_CHUNKS: int = 5
 
+    # Near-duplicate chunk elimination at ingestion
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.85
+    DEDUP_NUM_PERM: int = 128
+
     # ChromaDB settings
     CHROMA_SETTINGS: dict = {
             "chroma_db_impl": "duckdb+parquet",
             "anonymized_telemetry": False
         }
     
+    # Vector store backend: "chroma" or "numpy"
+    VECTOR_STORE_BACKEND: str = "chroma"
+    # Per-collection backend overrides, e.g. {"physics": "numpy"}
+    VECTOR_STORE_COLLECTION_BACKENDS: Dict[str, str] = {}
+    # Storage dtype for the numpy backend: float32, float16 or int8
+    NUMPY_STORE_DTYPE: str = "float32"
+    # Shards for the "sharded" backend: shard name -> persist directory
+    VECTOR_STORE_SHARDS: Dict[str, str] = {}
+    # Backend used inside every shard: "chroma" or "numpy"
+    VECTOR_STORE_SHARD_BACKEND: str = "chroma"
+
+    # Response cache for query variants, retrievals and answers
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_PATH: str = "db/response_cache.sqlite"
+
     # Embedding model configs
     EMBEDDING_MODEL: str = "BAAI/bge-small-en"
 
@@ -1,22 +1,36 @@
+import os
+import threading
 from typing import List, Dict, Optional
 import chromadb
 from chromadb.config import Settings
+from src.database.snapshot import export_store_snapshot, import_store_snapshot
 
 class ChromaDBClient:
-    """Singleton ChromaDB client manager"""
-    _instance = None
+    """ChromaDB client manager, one shared instance per persist directory"""
+    _instances: Dict[str, "ChromaDBClient"] = {}
+    _lock = threading.Lock()
 
     def __new__(cls, persist_dir: str = "db"):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.client = chromadb.PersistentClient(
-                path=persist_dir,
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
+        key = os.path.realpath(persist_dir)
+        with cls._lock:
+            if key not in cls._instances:
+                instance = super().__new__(cls)
+                instance.persist_dir = persist_dir
+                instance.client = chromadb.PersistentClient(
+                    path=persist_dir,
+                    settings=Settings(
+                        anonymized_telemetry=False,
+                        allow_reset=True
+                    )
                 )
-            )
-        return cls._instance
+                cls._instances[key] = instance
+            return cls._instances[key]
+
+    @classmethod
+    def release(cls, persist_dir: str):
+        """Forget the shared client for a persist directory"""
+        with cls._lock:
+            cls._instances.pop(os.path.realpath(persist_dir), None)
 
     def get_or_create_collection(self, name: str):
         """Get or create a collection"""
@@ -33,6 +47,23 @@ class ChromaDBClient:
     def list_collections(self):
         """Return list of collections"""
         return self.client.list_collections()
-        
-            
-    
\ No newline at end of file
+
+    def export_snapshot(self, name: str, path: str) -> Dict:
+        """Write a collection's ids, texts, metadata and embeddings to Parquet"""
+        from src.database.vector_store import ChromaVectorStore
+        return export_store_snapshot(ChromaVectorStore(self.persist_dir), name, path)
+
+    def import_snapshot(
+        self, path: str, name: Optional[str] = None, reset_collection: bool = False
+    ) -> Dict:
+        """Bulk-load a Parquet snapshot without recomputing embeddings
+
+        Args:
+            path: Snapshot written by `export_snapshot`
+            name: Target collection, defaults to the snapshot's collection
+            reset_collection: Delete the target collection first
+        """
+        from src.database.vector_store import ChromaVectorStore
+        return import_store_snapshot(
+            ChromaVectorStore(self.persist_dir), path, name, reset_collection
+        )
@@ -0,0 +1,344 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional
+import numpy as np
+from src.database.vector_store import (
+    VectorStore, CollectionGenerations, iter_conditions, matches_condition
+)
+from src.config.settings import get_settings
+from src.utils.logger import get_logger
+
+logger = get_logger()
+settings = get_settings()
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+INT8_SCALE = 127.0
+
+
+class _MappedCollection:
+    """In-memory view of one collection: memory-mapped vectors + metadata"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.clear()
+
+    @property
+    def vectors_file(self) -> Path:
+        return self.path / "vectors.npy"
+
+    @property
+    def records_file(self) -> Path:
+        return self.path / "records.json"
+
+    def refresh(self):
+        """Reload from disk if another writer replaced or deleted the files"""
+        try:
+            mtime = self.records_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            # Deleted (e.g. reset by another process): forget the old rows
+            if self.records_mtime is not None:
+                self.clear()
+            return
+        if mtime == self.records_mtime:
+            return
+
+        # Records are always written after the vectors, and vectors are
+        # append-only, so the first len(ids) rows are always valid
+        with open(self.records_file, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        vectors = np.load(self.vectors_file, mmap_mode="r")
+
+        self.dtype = records["dtype"]
+        self.ids = records["ids"]
+        self.documents = records["documents"]
+        self.metadatas = records["metadatas"]
+        self.vectors = vectors[:len(self.ids)]
+        self._field_index = {}
+        self.records_mtime = mtime
+
+    def clear(self):
+        """Drop the in-memory rows and mapping"""
+        self.records_mtime = None
+        self.dtype = None
+        self.vectors = None
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict] = []
+        # field -> {value: sorted row indices}, built lazily per field
+        self._field_index: Dict[str, Dict] = {}
+
+    def _index_for(self, field: str) -> Dict:
+        """Inverted index from metadata value to row indices for one field"""
+        if field not in self._field_index:
+            rows_by_value: Dict = {}
+            for row, metadata in enumerate(self.metadatas):
+                rows_by_value.setdefault((metadata or {}).get(field), []).append(row)
+            self._field_index[field] = {
+                value: np.asarray(rows, dtype=np.int64)
+                for value, rows in rows_by_value.items()
+            }
+        return self._field_index[field]
+
+    def select_rows(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        """Row indices matching a `where` filter, or None for all rows
+
+        Conditions are evaluated once per distinct metadata value rather
+        than once per row, so the cost depends on the number of distinct
+        sources/pages/sections, not on the collection size.
+        """
+        rows = None
+        for field, operator, operand in iter_conditions(where):
+            matched = [
+                value_rows
+                for value, value_rows in self._index_for(field).items()
+                if matches_condition(value, operator, operand)
+            ]
+            field_rows = (
+                np.unique(np.concatenate(matched)) if matched
+                else np.empty(0, dtype=np.int64)
+            )
+            rows = field_rows if rows is None else np.intersect1d(rows, field_rows)
+        return rows
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class NumpyVectorStore(VectorStore):
+    """Exact-search vector store on memory-mapped `.npy` files
+
+    Each collection lives in `<persist_dir>/numpy/<collection>/` as a
+    `vectors.npy` matrix of normalized embeddings plus a `records.json`
+    table holding ids, documents and metadata. Vectors are opened with
+    `mmap_mode="r"`, so worker processes reading the same collection share
+    the OS page cache instead of holding private copies. Writes rewrite the
+    files and atomically swap them in; use a single writer per collection.
+    """
+
+    backend_name = "numpy"
+    embedding_model = settings.EMBEDDING_MODEL
+
+    def __init__(
+        self,
+        persist_dir: str = "db",
+        embeddings=None,
+        dtype: str = "float32",
+        block_size: int = 8192
+    ):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Unsupported dtype: {dtype}. Choose one of {SUPPORTED_DTYPES}"
+            )
+        self.root = Path(persist_dir) / "numpy"
+        self.generations = CollectionGenerations(
+            Path(persist_dir) / "collection_generations" / self.backend_name
+        )
+        self.embeddings = embeddings
+        self.dtype = dtype
+        self.block_size = block_size
+        self._collections: Dict[str, _MappedCollection] = {}
+        self._lock = threading.Lock()
+
+    def _get_collection(self, name: str) -> _MappedCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = _MappedCollection(self.root / name)
+            collection = self._collections[name]
+        collection.refresh()
+        return collection
+
+    def _require_embeddings(self):
+        if self.embeddings is None:
+            raise ValueError("NumpyVectorStore needs an embedding model to embed text")
+        return self.embeddings
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _encode(self, vectors: np.ndarray, dtype: str) -> np.ndarray:
+        """Convert normalized float32 vectors to the storage dtype"""
+        if dtype == "int8":
+            return np.clip(np.rint(vectors * INT8_SCALE), -127, 127).astype(np.int8)
+        return vectors.astype(dtype)
+
+    @staticmethod
+    def _decode(block: np.ndarray, dtype: str) -> np.ndarray:
+        """Convert a block of stored vectors back to float32"""
+        block = np.asarray(block, dtype=np.float32)
+        if dtype == "int8":
+            block /= INT8_SCALE
+        return block
+
+    def add(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: List[Dict],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        prenormalized: bool = False
+    ) -> int:
+        collection = self._get_collection(collection_name)
+
+        # Skip ids that are already stored, as Chroma does
+        existing = set(collection.ids)
+        keep = [i for i, chunk_id in enumerate(ids) if chunk_id not in existing]
+        if len(keep) < len(ids):
+            logger.warning(
+                f"Skipping {len(ids) - len(keep)} existing ids in {collection_name}"
+            )
+        if not keep:
+            return 0
+        documents = [documents[i] for i in keep]
+        # Copy so callers can't mutate stored records through their dicts
+        metadatas = [dict(metadatas[i]) if metadatas[i] else None for i in keep]
+        ids = [ids[i] for i in keep]
+
+        if embeddings is None:
+            embeddings = self._embed_for_add(documents)
+        else:
+            embeddings = [embeddings[i] for i in keep]
+        new_vectors = np.asarray(embeddings, dtype=np.float32)
+        # Stored vectors (e.g. from an int8 snapshot) are only approximately
+        # unit length; renormalizing them would shift their encoded values
+        if not prenormalized:
+            new_vectors = self._normalize(new_vectors)
+
+        # An existing collection keeps the dtype it was created with
+        dtype = collection.dtype or self.dtype
+        new_vectors = self._encode(new_vectors, dtype)
+
+        collection.path.mkdir(parents=True, exist_ok=True)
+        n_old = len(collection)
+        tmp_vectors = collection.path / "vectors.tmp.npy"
+        out = np.lib.format.open_memmap(
+            tmp_vectors,
+            mode="w+",
+            dtype=new_vectors.dtype,
+            shape=(n_old + len(new_vectors), new_vectors.shape[1])
+        )
+        if n_old:
+            out[:n_old] = collection.vectors
+        out[n_old:] = new_vectors
+        out.flush()
+        del out
+
+        records = {
+            "dtype": dtype,
+            "ids": collection.ids + ids,
+            "documents": collection.documents + documents,
+            "metadatas": collection.metadatas + metadatas
+        }
+        tmp_records = collection.path / "records.tmp.json"
+        with open(tmp_records, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+
+        # Vectors first, then records (see _MappedCollection.refresh)
+        os.replace(tmp_vectors, collection.vectors_file)
+        os.replace(tmp_records, collection.records_file)
+        collection.refresh()
+        self.generations.bump(collection_name)
+        return len(ids)
+
+    def _search(
+        self,
+        collection: _MappedCollection,
+        query_vectors: np.ndarray,
+        n_results: int,
+        rows: Optional[np.ndarray] = None
+    ) -> List[List[Dict]]:
+        """Exact top-k by blocked matrix products over the mapped vectors
+
+        When `rows` is given only those rows are read from the map and
+        scored, so filtered queries cost O(len(rows)).
+        """
+        n = len(collection) if rows is None else len(rows)
+        k = min(n_results, n)
+        if k == 0:
+            return [[] for _ in range(len(query_vectors))]
+
+        scores = np.empty((len(query_vectors), n), dtype=np.float32)
+        for start in range(0, n, self.block_size):
+            if rows is None:
+                block = collection.vectors[start:start + self.block_size]
+            else:
+                block = collection.vectors[rows[start:start + self.block_size]]
+            block = self._decode(block, collection.dtype)
+            scores[:, start:start + len(block)] = query_vectors @ block.T
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        batches = []
+        for row, candidates in enumerate(top):
+            candidates = candidates[np.argsort(-scores[row, candidates])]
+            order = candidates if rows is None else rows[candidates]
+            batches.append([
+                {
+                    "id": collection.ids[i],
+                    "content": collection.documents[i],
+                    # A copy: callers annotate result metadata in place
+                    "metadata": dict(collection.metadatas[i] or {}),
+                    "distance": float(1.0 - score)
+                }
+                for i, score in zip(order, scores[row, candidates])
+                if collection.documents[i]
+            ])
+        return batches
+
+    def query_batch(
+        self,
+        collection_name: str,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        collection = self._get_collection(collection_name)
+        rows = collection.select_rows(where)
+        if not len(collection) or (rows is not None and not len(rows)):
+            return [[] for _ in queries]
+        embedder = self._require_embeddings()
+        query_vectors = self._normalize(
+            np.asarray([embedder.embed_query(q) for q in queries], dtype=np.float32)
+        )
+        return self._search(collection, query_vectors, n_results, rows)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._require_embeddings().embed_documents(texts)
+
+    def get_all(
+        self, collection_name: str, include_embeddings: bool = False
+    ) -> Dict[str, List]:
+        collection = self._get_collection(collection_name)
+        data = {
+            "ids": list(collection.ids),
+            "documents": list(collection.documents),
+            "metadatas": [dict(m) if m else m for m in collection.metadatas]
+        }
+        if include_embeddings:
+            data["embeddings"] = (
+                self._decode(collection.vectors, collection.dtype) if len(collection)
+                else np.empty((0, 0), dtype=np.float32)
+            )
+        return data
+
+    def count(self, collection_name: str) -> int:
+        return len(self._get_collection(collection_name))
+
+    def delete_collection(self, collection_name: str) -> bool:
+        with self._lock:
+            self._collections.pop(collection_name, None)
+        self.generations.bump(collection_name)
+        path = self.root / collection_name
+        if not path.exists():
+            return False
+        try:
+            for file in path.iterdir():
+                file.unlink()
+            path.rmdir()
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,346 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Optional
+from src.database.vector_store import VectorStore, create_vector_store, iter_conditions
+from src.utils.file_lock import file_lock
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class ShardRouter(VectorStore):
+    """Spread a logical collection across several stores, one per shard
+
+    Every source file is assigned to exactly one shard the first time it is
+    ingested (the shard currently holding the fewest chunks). The
+    assignments, together with the shards added or dropped at runtime, are
+    kept in `<persist_dir>/shard_routes.json`, which is reloaded whenever
+    another process changes it and only rewritten under a file lock after
+    merging with the on-disk copy, so every process and restart sees the
+    same shards and routes. Adding a shard therefore never moves existing
+    sources, and a shard can be dropped or rebuilt without touching the
+    others. Queries fan out to all relevant shards in parallel threads and
+    the per-shard top-k lists are merged by distance, so shards must all
+    use the same backend and embedding model.
+    """
+
+    backend_name = "sharded"
+
+    def __init__(
+        self,
+        shards: Dict[str, str],
+        persist_dir: str = "db",
+        backend: str = "chroma",
+        embeddings=None
+    ):
+        """
+        Args:
+            shards: Mapping of shard name to that shard's persist directory;
+                shards dropped at runtime stay dropped
+            persist_dir: Directory holding the routing table
+            backend: Backend used by every shard ("chroma" or "numpy")
+            embeddings: Embedding model for backends that need one
+        """
+        if not shards:
+            raise ValueError("ShardRouter needs at least one shard")
+        self.backend = backend
+        self.embeddings = embeddings
+        self.routes_file = Path(persist_dir) / "shard_routes.json"
+        self.lock_file = Path(persist_dir) / "shard_routes.lock"
+        self.configured_shards = dict(shards)
+        # Replaced, never mutated, so readers can iterate without the lock
+        self.shards: Dict[str, VectorStore] = {}
+        self.shard_dirs: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._table = self._empty_table()
+        self._routes_mtime = None
+        self._refresh(force=True)
+        if not self.shards:
+            raise ValueError("Every configured shard has been dropped")
+        first_shard = next(iter(self.shards.values()))
+        self.embedding_model = first_shard.embedding_model
+        self.max_add_batch = first_shard.max_add_batch
+
+    @staticmethod
+    def _empty_table() -> Dict:
+        """Routing table: shards added/dropped at runtime and
+        {collection: {source: shard}} routes"""
+        return {"added": {}, "dropped": [], "routes": {}}
+
+    def _refresh(self, force: bool = False):
+        """Reload the routing table if the file changed on disk"""
+        with self._lock:
+            try:
+                mtime = self.routes_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if not force and mtime == self._routes_mtime:
+                return
+            table = self._empty_table()
+            if mtime is not None:
+                with open(self.routes_file, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                # Older files only held the routes
+                table.update(stored if "routes" in stored else {"routes": stored})
+            self._table, self._routes_mtime = table, mtime
+            self._sync_shards()
+
+    def _sync_shards(self):
+        """Open shards added and close shards dropped in the routing table"""
+        wanted = {**self.configured_shards, **self._table["added"]}
+        for name in self._table["dropped"]:
+            wanted.pop(name, None)
+
+        shards, shard_dirs = dict(self.shards), dict(self.shard_dirs)
+        for name in [name for name in shards if name not in wanted]:
+            del shards[name]
+            shard_dir = shard_dirs.pop(name)
+            if self.backend == "chroma":
+                from src.database.chroma_client import ChromaDBClient
+                ChromaDBClient.release(shard_dir)
+            logger.info(f"Closed dropped shard {name}")
+        for name, shard_dir in wanted.items():
+            if name not in shards:
+                shards[name] = create_vector_store(
+                    backend=self.backend,
+                    persist_dir=shard_dir,
+                    embeddings=self.embeddings
+                )
+                shard_dirs[name] = shard_dir
+                logger.info(f"Opened shard {name} at {shard_dir}")
+        self.shards, self.shard_dirs = shards, shard_dirs
+
+    @contextmanager
+    def _editing_table(self):
+        """Lock the routing table across processes, reload it, save on exit"""
+        with self._lock, file_lock(self.lock_file):
+            self._refresh(force=True)
+            yield self._table
+            self.routes_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.routes_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._table, f, indent=2)
+            os.replace(tmp_file, self.routes_file)
+            self._routes_mtime = self.routes_file.stat().st_mtime_ns
+            self._sync_shards()
+
+    def add_shard(self, name: str, persist_dir: str):
+        """Register a shard in every process; new sources may be routed to
+        it immediately"""
+        self._refresh()
+        if self.shard_dirs.get(name) == persist_dir:
+            return
+        with self._editing_table() as table:
+            table["added"][name] = persist_dir
+            if name in table["dropped"]:
+                table["dropped"].remove(name)
+
+    def drop_shard(self, name: str, delete_data: bool = False) -> List[str]:
+        """Remove a shard and its routes in every process
+
+        Returns:
+            The sources that were routed to the shard, so they can be
+            re-ingested elsewhere
+        """
+        with self._editing_table() as table:
+            store = self.shards.get(name)
+            if store is None:
+                return []
+            if len(self.shards) == 1:
+                raise ValueError(f"Cannot drop {name}, the only shard")
+            table["added"].pop(name, None)
+            table["dropped"].append(name)
+            orphaned = []
+            for collection_name, routes in table["routes"].items():
+                for source in [s for s, shard in routes.items() if shard == name]:
+                    orphaned.append(source)
+                    del routes[source]
+                if delete_data:
+                    store.delete_collection(collection_name)
+        logger.info(f"Dropped shard {name}, {len(orphaned)} sources orphaned")
+        return orphaned
+
+    def clear_shard(self, name: str, collection_name: str) -> List[str]:
+        """Empty one shard's part of a collection, ahead of a rebuild
+
+        Returns:
+            The sources to re-ingest; they are routed back to this shard
+        """
+        with self._lock:
+            self._refresh()
+            self.shards[name].delete_collection(collection_name)
+            return self.sources_on_shard(name, collection_name)
+
+    def sources_on_shard(self, name: str, collection_name: str) -> List[str]:
+        """Sources of a collection that live on a shard"""
+        self._refresh()
+        routes = self._table["routes"].get(collection_name, {})
+        return sorted(source for source, shard in routes.items() if shard == name)
+
+    def route(
+        self, collection_name: str, source: str, pending: Optional[Dict[str, int]] = None
+    ) -> str:
+        """Shard name for a source, assigning one on first use
+
+        Args:
+            pending: Chunks per shard not yet written, counted as load
+        """
+        pending = pending or {}
+        self._refresh()
+        shard = self._table["routes"].get(collection_name, {}).get(source)
+        if shard in self.shards:
+            return shard
+
+        with self._editing_table() as table:
+            routes = table["routes"].setdefault(collection_name, {})
+            # Another process may have routed the source meanwhile
+            shard = routes.get(source)
+            if shard not in self.shards:
+                shard = min(
+                    self.shards,
+                    key=lambda name: (
+                        self.shards[name].count(collection_name) + pending.get(name, 0)
+                    )
+                )
+                routes[source] = shard
+        return shard
+
+    def _target_shards(self, collection_name: str, where: Optional[Dict]) -> List[str]:
+        """Shards that can hold results for a filter, pruned by source
+
+        A source without a known route (e.g. routed to a shard this process
+        doesn't have) disables pruning rather than hiding its chunks.
+        """
+        self._refresh()
+        routes = self._table["routes"].get(collection_name, {})
+        targets = None
+        for field, operator, operand in iter_conditions(where):
+            if field != "source" or operator not in ("$eq", "$in"):
+                continue
+            sources = [operand] if operator == "$eq" else operand
+            if any(routes.get(s) not in self.shards for s in sources):
+                return list(self.shards)
+            shards = {routes[s] for s in sources}
+            targets = shards if targets is None else targets & shards
+        if targets is None:
+            return list(self.shards)
+        return [name for name in self.shards if name in targets]
+
+    def add(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: List[Dict],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        prenormalized: bool = False
+    ) -> int:
+        # Group rows by the shard their source is routed to
+        rows_by_source: Dict[str, List[int]] = {}
+        for i, metadata in enumerate(metadatas):
+            source = (metadata or {}).get("source", "")
+            rows_by_source.setdefault(source, []).append(i)
+
+        rows_by_shard: Dict[str, List[int]] = {}
+        for source, rows in rows_by_source.items():
+            pending = {name: len(shard_rows) for name, shard_rows in rows_by_shard.items()}
+            shard = self.route(collection_name, source, pending)
+            rows_by_shard.setdefault(shard, []).extend(rows)
+
+        added = 0
+        for shard, rows in rows_by_shard.items():
+            added += self.shards[shard].add(
+                collection_name=collection_name,
+                documents=[documents[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows],
+                ids=[ids[i] for i in rows],
+                embeddings=[embeddings[i] for i in rows] if embeddings is not None else None,
+                prenormalized=prenormalized
+            )
+        return added
+
+    def query_batch(
+        self,
+        collection_name: str,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        targets = self._target_shards(collection_name, where)
+        shards = self.shards
+
+        # One thread per target shard; the shard set can change at runtime
+        merged = [[] for _ in queries]
+        with ThreadPoolExecutor(
+            max_workers=max(len(targets), 1), thread_name_prefix="shard-query"
+        ) as executor:
+            futures = {
+                name: executor.submit(
+                    shards[name].query_batch, collection_name, queries, n_results, where
+                )
+                for name in targets
+            }
+
+            # Merge per-query results from all shards by distance
+            for name, future in futures.items():
+                try:
+                    batches = future.result()
+                except Exception as e:
+                    logger.error(f"Shard {name} query failed: {str(e)}")
+                    continue
+                for i, chunks in enumerate(batches):
+                    for chunk in chunks:
+                        chunk["shard"] = name
+                    merged[i].extend(chunks)
+
+        return [
+            sorted(chunks, key=lambda c: c["distance"])[:n_results]
+            for chunks in merged
+        ]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return next(iter(self.shards.values())).embed_documents(texts)
+
+    @property
+    def embedding_seconds_per_chunk(self) -> Optional[float]:
+        measured = [
+            store.embedding_seconds_per_chunk for store in self.shards.values()
+            if store.embedding_seconds_per_chunk is not None
+        ]
+        return sum(measured) / len(measured) if measured else None
+
+    def get_all(
+        self, collection_name: str, include_embeddings: bool = False
+    ) -> Dict[str, List]:
+        data = {"ids": [], "documents": [], "metadatas": []}
+        if include_embeddings:
+            data["embeddings"] = []
+        self._refresh()
+        for store in self.shards.values():
+            shard_data = store.get_all(collection_name, include_embeddings)
+            for key in data:
+                data[key].extend(shard_data[key])
+        return data
+
+    def count(self, collection_name: str) -> int:
+        self._refresh()
+        return sum(store.count(collection_name) for store in self.shards.values())
+
+    def collection_version(self, collection_name: str) -> str:
+        self._refresh()
+        return "|".join(
+            f"{name}={store.collection_version(collection_name)}"
+            for name, store in sorted(self.shards.items())
+        )
+
+    def delete_collection(self, collection_name: str) -> bool:
+        with self._editing_table() as table:
+            deleted = [
+                store.delete_collection(collection_name) for store in self.shards.values()
+            ]
+            table["routes"].pop(collection_name, None)
+        return any(deleted)
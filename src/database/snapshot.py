@@ -0,0 +1,194 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.utils.exceptions import SnapshotError
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+SNAPSHOT_FORMAT_VERSION = "1"
+
+
+def _checksum(
+    ids: List[str], documents: List[str], metadatas: List[str], embeddings: np.ndarray
+) -> str:
+    """SHA-256 over every row's id, text, metadata JSON and embedding"""
+    digest = hashlib.sha256()
+    for chunk_id, document, metadata in zip(ids, documents, metadatas):
+        digest.update(chunk_id.encode("utf-8") + b"\0")
+        digest.update((document or "").encode("utf-8") + b"\0")
+        digest.update(metadata.encode("utf-8") + b"\0")
+    digest.update(np.ascontiguousarray(embeddings, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+def write_snapshot(
+    path: str,
+    data: Dict[str, List],
+    collection_name: str,
+    embedding_model: str
+) -> Dict:
+    """Write a collection to a Parquet snapshot
+
+    Args:
+        path: Output `.parquet` file
+        data: `ids`, `documents`, `metadatas` and `embeddings` of the collection
+        collection_name: Recorded for reference
+        embedding_model: Model that produced the embeddings; imports into a
+            store using a different model are refused
+
+    Returns:
+        Dict describing the snapshot (count, dim, checksum, path)
+    """
+    count = len(data["ids"])
+    embeddings = np.asarray(data["embeddings"], dtype=np.float32)
+    embeddings = embeddings.reshape(count, -1) if count else embeddings.reshape(0, 0)
+    dim = int(embeddings.shape[1])
+
+    # Sort by id so the same collection always gives the same file
+    order = sorted(range(count), key=lambda i: data["ids"][i])
+    ids = [data["ids"][i] for i in order]
+    documents = [data["documents"][i] for i in order]
+    metadatas = [json.dumps(data["metadatas"][i] or {}, sort_keys=True) for i in order]
+    embeddings = embeddings[order]
+
+    checksum = _checksum(ids, documents, metadatas, embeddings)
+    schema_metadata = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "collection": collection_name,
+        "embedding_model": embedding_model,
+        "count": str(count),
+        "dim": str(dim),
+        "checksum": checksum
+    }
+    table = pa.table(
+        {
+            "id": pa.array(ids, type=pa.string()),
+            "document": pa.array(documents, type=pa.string()),
+            "metadata": pa.array(metadatas, type=pa.string()),
+            # Variable-size list type so empty collections (dim 0) also work
+            "embedding": pa.ListArray.from_arrays(
+                pa.array(np.arange(count + 1, dtype=np.int32) * dim, type=pa.int32()),
+                pa.array(embeddings.reshape(-1), type=pa.float32())
+            )
+        }
+    ).replace_schema_metadata(schema_metadata)
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path, compression="zstd")
+    logger.info(f"Wrote snapshot of {collection_name} ({count} chunks) to {path}")
+    return {**schema_metadata, "path": str(path)}
+
+
+def read_snapshot_info(path: str) -> Dict:
+    """Recorded metadata of a snapshot, without reading its rows"""
+    try:
+        schema = pq.read_schema(path)
+    except Exception as e:
+        raise SnapshotError(f"Could not read snapshot {path}: {str(e)}")
+    return {
+        key.decode(): value.decode()
+        for key, value in (schema.metadata or {}).items()
+    }
+
+
+def read_snapshot(
+    path: str, expected_model: Optional[str] = None
+) -> Tuple[Dict[str, List], Dict]:
+    """Read and verify a Parquet snapshot
+
+    Args:
+        path: Snapshot file written by `write_snapshot`
+        expected_model: Embedding model of the target store, if known
+
+    Returns:
+        (data, info): `ids`, `documents`, `metadatas` and a float32
+        `embeddings` matrix, plus the snapshot's recorded metadata
+    """
+    try:
+        table = pq.read_table(path)
+    except Exception as e:
+        raise SnapshotError(f"Could not read snapshot {path}: {str(e)}")
+
+    info = {
+        key.decode(): value.decode()
+        for key, value in (table.schema.metadata or {}).items()
+    }
+    if info.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format: {info.get('format_version')}")
+    if expected_model and info["embedding_model"] != expected_model:
+        raise SnapshotError(
+            f"Snapshot embeddings come from {info['embedding_model']}, "
+            f"target store uses {expected_model}"
+        )
+
+    ids = table.column("id").to_pylist()
+    documents = table.column("document").to_pylist()
+    metadata_json = table.column("metadata").to_pylist()
+    if len(ids) != int(info["count"]):
+        raise SnapshotError(f"Snapshot {path} holds {len(ids)} rows, expected {info['count']}")
+    dim = int(info["dim"])
+    values = table.column("embedding").combine_chunks().flatten().to_numpy()
+    if values.size != len(ids) * dim:
+        raise SnapshotError(f"Snapshot {path} has embeddings of inconsistent size")
+    embeddings = values.astype(np.float32).reshape(len(ids), dim)
+
+    if _checksum(ids, documents, metadata_json, embeddings) != info["checksum"]:
+        raise SnapshotError(f"Checksum mismatch in snapshot {path}")
+
+    data = {
+        "ids": ids,
+        "documents": documents,
+        # ChromaDB rejects empty metadata dicts, so store None instead
+        "metadatas": [json.loads(metadata) or None for metadata in metadata_json],
+        "embeddings": embeddings
+    }
+    return data, info
+
+
+def iter_batches(data: Dict[str, List], batch_size: Optional[int]):
+    """Yield slices of snapshot data with at most `batch_size` rows"""
+    count = len(data["ids"])
+    batch_size = batch_size or max(count, 1)
+    for start in range(0, count, batch_size):
+        yield {key: values[start:start + batch_size] for key, values in data.items()}
+
+
+def export_store_snapshot(store, collection_name: str, path: str) -> Dict:
+    """Write a vector store collection, embeddings included, to a snapshot"""
+    return write_snapshot(
+        path=path,
+        data=store.get_all(collection_name, include_embeddings=True),
+        collection_name=collection_name,
+        embedding_model=store.embedding_model
+    )
+
+
+def import_store_snapshot(
+    store,
+    path: str,
+    collection_name: Optional[str] = None,
+    reset_collection: bool = False
+) -> Dict:
+    """Bulk-load a snapshot into a vector store without re-embedding
+
+    The checksum and embedding model are verified before anything is
+    written; rows are added in the largest batches the store accepts.
+
+    Raises:
+        SnapshotError: If the snapshot is corrupt or from another model
+    """
+    data, info = read_snapshot(path, expected_model=store.embedding_model)
+    collection_name = collection_name or info["collection"]
+    if reset_collection:
+        store.delete_collection(collection_name)
+
+    imported = 0
+    for batch in iter_batches(data, store.max_add_batch):
+        imported += store.add(collection_name=collection_name, prenormalized=True, **batch)
+    logger.info(f"Imported {imported} chunks from {path} into {collection_name}")
+    return {**info, "collection": collection_name, "path": str(path), "chunks": imported}
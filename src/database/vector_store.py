@@ -0,0 +1,343 @@
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, List, Dict, Optional
+from src.config.constants import CHROMA_DEFAULT_EMBEDDING_MODEL
+from src.config.settings import get_settings
+from src.utils.logger import get_logger
+
+logger = get_logger()
+settings = get_settings()
+
+
+class CollectionGenerations:
+    """Generation tokens for collections, one small side file per collection
+
+    Stores bump the token on every add and delete, so a collection that is
+    reset and re-ingested never gets its old tag back, even when it ends up
+    with the same number of chunks. Tokens are random and written with an
+    atomic replace, so concurrent writers need no lock.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _file(self, collection_name: str) -> Path:
+        return self.root / f"{collection_name}.gen"
+
+    def bump(self, collection_name: str) -> str:
+        token = uuid.uuid4().hex
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.root / f"{collection_name}.{token}.tmp"
+        tmp_file.write_text(token, encoding="utf-8")
+        os.replace(tmp_file, self._file(collection_name))
+        return token
+
+    def get(self, collection_name: str) -> str:
+        try:
+            return self._file(collection_name).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return "0"
+
+
+class VectorStore:
+    """Common interface implemented by every vector store backend
+
+    Query results are returned as a list of dicts with the keys
+    `id`, `content`, `metadata` and `distance` (lower is closer).
+
+    `where` filters map a metadata field to either a value (equality) or a
+    dict of operators (`$in`, `$nin`, `$ne`, `$gt`, `$gte`, `$lt`, `$lte`);
+    all fields must match. Backends apply the filter inside the search.
+    """
+
+    backend_name = "base"
+    # Model the stored embeddings come from, recorded in snapshots
+    embedding_model: Optional[str] = None
+    # Largest number of rows a single add() call accepts, None for no limit
+    max_add_batch: Optional[int] = None
+    # Set by backends that bump a generation on every write
+    generations: Optional[CollectionGenerations] = None
+    # Seconds per chunk of the latest embedding done by add(), None until
+    # this store has embedded something
+    embedding_seconds_per_chunk: Optional[float] = None
+
+    def add(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: List[Dict],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        prenormalized: bool = False
+    ) -> int:
+        """Add documents to a collection, return the number added
+
+        Args:
+            embeddings: Precomputed embeddings; the store embeds when None
+            prenormalized: `embeddings` are stored vectors read back from a
+                store (e.g. a snapshot) and must be kept exactly as given
+        """
+        raise NotImplementedError
+
+    def query(
+        self,
+        collection_name: str,
+        query: str,
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Return the `n_results` closest chunks for a query"""
+        return self.query_batch(collection_name, [query], n_results, where)[0]
+
+    def query_batch(
+        self,
+        collection_name: str,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """Return the closest chunks for each query in `queries`"""
+        raise NotImplementedError
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the model this store uses for its documents"""
+        raise NotImplementedError
+
+    def _embed_for_add(self, documents: List[str]) -> List[List[float]]:
+        """Embed documents being added and record the per-chunk cost
+
+        The latest call wins, so the model loading counted by the first
+        call is replaced as soon as the store embeds again.
+        """
+        start = time.perf_counter()
+        embeddings = self.embed_documents(documents)
+        self.embedding_seconds_per_chunk = (time.perf_counter() - start) / len(documents)
+        return embeddings
+
+    def get_all(
+        self, collection_name: str, include_embeddings: bool = False
+    ) -> Dict[str, List]:
+        """Return every chunk of a collection
+
+        Returns:
+            Dict with `ids`, `documents`, `metadatas` and, when requested,
+            `embeddings` lists in matching order
+        """
+        raise NotImplementedError
+
+    def count(self, collection_name: str) -> int:
+        """Number of chunks stored in a collection"""
+        raise NotImplementedError
+
+    def delete_collection(self, collection_name: str) -> bool:
+        """Delete a collection, return False if it could not be deleted"""
+        raise NotImplementedError
+
+    def collection_version(self, collection_name: str) -> str:
+        """Tag that changes when a collection's contents change
+
+        Used to invalidate cached retrievals and answers.
+        """
+        generation = self.generations.get(collection_name) if self.generations else "0"
+        return f"{self.backend_name}:{self.count(collection_name)}:{generation}"
+
+
+class ChromaVectorStore(VectorStore):
+    """Vector store backed by a ChromaDB persistent client"""
+
+    backend_name = "chroma"
+    embedding_model = CHROMA_DEFAULT_EMBEDDING_MODEL
+
+    def __init__(self, persist_dir: str = "db"):
+        # Imported here so other backends work without chromadb installed
+        from src.database.chroma_client import ChromaDBClient
+        self.db_client = ChromaDBClient(persist_dir=persist_dir)
+        self.max_add_batch = self.db_client.client.get_max_batch_size()
+        self.generations = CollectionGenerations(
+            Path(persist_dir) / "collection_generations" / self.backend_name
+        )
+        self._embedding_function = None
+
+    def add(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: List[Dict],
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        prenormalized: bool = False
+    ) -> int:
+        if embeddings is None:
+            embeddings = self._embed_for_add(documents)
+        collection = self.db_client.get_or_create_collection(name=collection_name)
+        collection.add(
+            documents=documents,
+            metadatas=metadatas,
+            ids=ids,
+            embeddings=embeddings
+        )
+        self.generations.bump(collection_name)
+        return len(ids)
+
+    def query_batch(
+        self,
+        collection_name: str,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        collection = self.db_client.get_or_create_collection(name=collection_name)
+        results = collection.query(
+            query_embeddings=self.embed_documents(queries),
+            n_results=n_results,
+            where=to_chroma_where(where)
+        )
+
+        # Format results
+        batches = []
+        for i in range(len(queries)):
+            chunks = []
+            for chunk_id, doc, metadata, distance in zip(
+                results['ids'][i],
+                results['documents'][i],
+                results['metadatas'][i],
+                results['distances'][i]
+            ):
+                if doc:  # Skip empty chunks
+                    chunks.append({
+                        "id": chunk_id,
+                        "content": doc,
+                        "metadata": metadata,
+                        "distance": distance
+                    })
+            batches.append(chunks)
+        return batches
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Collections are created without an embedding function, so they
+        # use ChromaDB's default one. Adds and queries embed through this
+        # instance, so the model is only loaded once per store.
+        if self._embedding_function is None:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+            self._embedding_function = DefaultEmbeddingFunction()
+        return self._embedding_function(texts)
+
+    def get_all(
+        self, collection_name: str, include_embeddings: bool = False
+    ) -> Dict[str, List]:
+        collection = self.db_client.get_or_create_collection(name=collection_name)
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
+        results = collection.get(include=include)
+        data = {
+            "ids": results["ids"],
+            "documents": results["documents"],
+            "metadatas": results["metadatas"]
+        }
+        if include_embeddings:
+            data["embeddings"] = results["embeddings"]
+        return data
+
+    def count(self, collection_name: str) -> int:
+        return self.db_client.get_or_create_collection(name=collection_name).count()
+
+    def delete_collection(self, collection_name: str) -> bool:
+        deleted = self.db_client.delete_collection(name=collection_name)
+        self.generations.bump(collection_name)
+        return deleted
+
+
+def iter_conditions(where: Optional[Dict]):
+    """Yield (field, operator, operand) triples from a `where` filter"""
+    for field, condition in (where or {}).items():
+        if isinstance(condition, dict):
+            for operator, operand in condition.items():
+                yield field, operator, operand
+        else:
+            yield field, "$eq", condition
+
+
+def matches_condition(value: Any, operator: str, operand: Any) -> bool:
+    """Check a single metadata value against one filter operator"""
+    if operator == "$eq":
+        return value == operand
+    if operator == "$ne":
+        return value != operand
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    try:
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        if operator == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def to_chroma_where(where: Optional[Dict]) -> Optional[Dict]:
+    """Convert a flat `where` filter into ChromaDB's single-operator form"""
+    clauses = [
+        {field: {operator: operand}} for field, operator, operand in iter_conditions(where)
+    ]
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def get_backend_name(collection_name: str) -> str:
+    """Resolve the configured backend for a collection"""
+    return settings.VECTOR_STORE_COLLECTION_BACKENDS.get(
+        collection_name, settings.VECTOR_STORE_BACKEND
+    )
+
+
+def needs_embeddings(backend: str) -> bool:
+    """Whether a backend embeds text with our model rather than internally"""
+    if backend == "sharded":
+        return settings.VECTOR_STORE_SHARD_BACKEND == "numpy"
+    return backend == "numpy"
+
+
+def create_vector_store(
+    backend: str, persist_dir: str = "db", embeddings=None
+) -> VectorStore:
+    """Create a vector store for the given backend name
+
+    Args:
+        backend: "chroma", "numpy" or "sharded"
+        persist_dir: Root directory for the store's files
+        embeddings: Embedding model with `embed_documents`/`embed_query`,
+            required by backends that do not embed internally
+    """
+    if backend == "chroma":
+        return ChromaVectorStore(persist_dir=persist_dir)
+    if backend == "numpy":
+        from src.database.numpy_store import NumpyVectorStore
+        return NumpyVectorStore(
+            persist_dir=persist_dir,
+            embeddings=embeddings,
+            dtype=settings.NUMPY_STORE_DTYPE
+        )
+    if backend == "sharded":
+        from src.database.shard_router import ShardRouter
+        return ShardRouter(
+            shards=settings.VECTOR_STORE_SHARDS,
+            persist_dir=persist_dir,
+            backend=settings.VECTOR_STORE_SHARD_BACKEND,
+            embeddings=embeddings
+        )
+    raise ValueError(f"Unknown vector store backend: {backend}")
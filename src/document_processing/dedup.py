@@ -0,0 +1,146 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import mmh3
+import numpy as np
+
+# Largest 32-bit prime, the modulus for the universal hash permutations
+_MERSENNE_PRIME = np.uint64((1 << 32) - 5)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Weight of missed duplicates against extra candidates when choosing bands.
+# Candidates are confirmed with the exact Jaccard similarity, so an extra
+# candidate only costs one comparison while a miss stores a duplicate.
+FALSE_NEGATIVE_WEIGHT = 0.99
+
+
+@lru_cache(maxsize=None)
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) with bands * rows <= num_perm minimizing the
+    weighted false-positive and false-negative areas of the LSH S-curve,
+    as datasketch does"""
+    below = np.linspace(0.0, threshold, 201)
+    above = np.linspace(threshold, 1.0, 201)
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            # Probability that a pair with similarity s shares a band
+            false_positive = np.mean(1.0 - (1.0 - below ** rows) ** bands) * threshold
+            false_negative = np.mean((1.0 - above ** rows) ** bands) * (1.0 - threshold)
+            error = (
+                (1.0 - FALSE_NEGATIVE_WEIGHT) * false_positive
+                + FALSE_NEGATIVE_WEIGHT * false_negative
+            )
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashDeduplicator:
+    """Near-duplicate detector using MinHash signatures and LSH banding
+
+    Texts are shingled into overlapping word n-grams, each shingle is
+    hashed once with mmh3 and `num_perm` universal hash permutations are
+    applied in a single vectorized step. Signatures are bucketed per band so
+    a lookup only compares against likely candidates. The bands are chosen
+    so pairs at the threshold are almost always candidates, and candidates
+    are confirmed with the exact Jaccard similarity of their shingle hashes.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        seed: int = 1
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(self.bands)]
+        # key -> sorted unique shingle hashes, for exact confirmation
+        self._hashes: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def _shingles(self, text: str) -> set:
+        words = text.lower().split()
+        if len(words) <= self.shingle_size:
+            return {" ".join(words)}
+        return {
+            " ".join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def shingle_hashes(self, text: str) -> np.ndarray:
+        """Sorted unique mmh3 hashes of a text's shingles"""
+        return np.unique(np.fromiter(
+            (mmh3.hash(shingle, signed=False) for shingle in self._shingles(text)),
+            dtype=np.uint32
+        ))
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """MinHash signature of a text's shingle hashes"""
+        hashes = hashes.astype(np.uint64)
+        # (a * h + b) mod p for every (permutation, shingle) pair
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return np.minimum(permuted, _MAX_HASH).min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def jaccard(first: np.ndarray, second: np.ndarray) -> float:
+        """Exact Jaccard similarity of two sorted unique hash arrays"""
+        shared = len(np.intersect1d(first, second, assume_unique=True))
+        return shared / (len(first) + len(second) - shared)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def _find(self, hashes: np.ndarray, band_keys: List[bytes]) -> Optional[str]:
+        checked = set()
+        for band, key in enumerate(band_keys):
+            for candidate in self._buckets[band].get(key, []):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if self.jaccard(self._hashes[candidate], hashes) >= self.threshold:
+                    return candidate
+        return None
+
+    def _index(self, key: str, hashes: np.ndarray, band_keys: List[bytes]):
+        self._hashes[key] = hashes
+        for band, band_key in enumerate(band_keys):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def find_duplicate(self, text: str) -> Optional[str]:
+        """Key of an indexed text similar to `text`, if any"""
+        hashes = self.shingle_hashes(text)
+        return self._find(hashes, self._band_keys(self.signature(hashes)))
+
+    def add(self, key: str, text: str):
+        """Index `text` under `key`"""
+        hashes = self.shingle_hashes(text)
+        self._index(key, hashes, self._band_keys(self.signature(hashes)))
+
+    def add_if_unique(self, key: str, text: str) -> Optional[str]:
+        """Index `text` unless it near-duplicates an indexed text
+
+        Returns:
+            None if the text was added, otherwise the duplicate's key
+        """
+        hashes = self.shingle_hashes(text)
+        band_keys = self._band_keys(self.signature(hashes))
+        duplicate = self._find(hashes, band_keys)
+        if duplicate is None:
+            self._index(key, hashes, band_keys)
+        return duplicate
@@ -1,11 +1,20 @@
-from typing import Dict, List
+import threading
+from typing import Dict, List, Optional
 from pathlib import Path
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 from langchain_huggingface.embeddings import HuggingFaceEmbeddings
 from src.document_processing.pdf_extractor import PDFParser
-from src.document_processing.utils import clean_text, validate_collection_name
-from src.database.chroma_client import ChromaDBClient
+from src.document_processing.dedup import MinHashDeduplicator
+from src.document_processing.utils import (
+    clean_text, validate_collection_name, extract_headings, apply_headings
+)
+from src.database.snapshot import (
+    export_store_snapshot, import_store_snapshot, read_snapshot_info
+)
+from src.database.vector_store import (
+    VectorStore, create_vector_store, get_backend_name, needs_embeddings
+)
 from src.utils.logger import get_logger
 from src.config.settings import get_settings
 
@@ -20,12 +29,22 @@ class DocumentProcessor:
         # Lzy loading for embeddings
         self._embeddings = None 
         
-        self.db_client = ChromaDBClient(persist_dir=persist_dir)
+        self.persist_dir = persist_dir
+        # Only opened when used, so other backends work without chromadb
+        self._db_client = None
+        # Vector stores are created on first use, one per backend
+        self._stores: Dict[str, VectorStore] = {}
+        # MinHash indexes of stored chunks, one per collection
+        self._dedup_indexes: Dict[str, MinHashDeduplicator] = {}
+        # Guards lazy initialization when used from several threads
+        # (e.g. the cache warmer), so nothing is loaded twice
+        self._init_lock = threading.RLock()
 
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.CHUNK_SIZE,
             chunk_overlap=settings.CHUNK_OVERLAP,
             length_function=len,
+            add_start_index=True,
             separators=[
                 "\n\n",
                 "\n",
@@ -46,36 +65,86 @@ class DocumentProcessor:
     @property
     def embeddings(self):
         """Lazy load embeddings when first needed"""
-        if self._embeddings is None:
-            self._embeddings = HuggingFaceEmbeddings(
-                model_name=settings.EMBEDDING_MODEL,
-                model_kwargs={"device": "cpu"},
-                encode_kwargs={"normalize_embeddings": True} 
-            )
+        with self._init_lock:
+            if self._embeddings is None:
+                self._embeddings = HuggingFaceEmbeddings(
+                    model_name=settings.EMBEDDING_MODEL,
+                    model_kwargs={"device": "cpu"},
+                    encode_kwargs={"normalize_embeddings": True} 
+                )
         return self._embeddings
+
+    @property
+    def db_client(self):
+        """Lazy load the ChromaDB client when first needed"""
+        with self._init_lock:
+            if self._db_client is None:
+                from src.database.chroma_client import ChromaDBClient
+                self._db_client = ChromaDBClient(persist_dir=self.persist_dir)
+        return self._db_client
+
+    def get_store(self, collection_name: str) -> VectorStore:
+        """Get the vector store configured for a collection"""
+        backend = get_backend_name(collection_name)
+        with self._init_lock:
+            if backend not in self._stores:
+                embeddings = self.embeddings if needs_embeddings(backend) else None
+                self._stores[backend] = create_vector_store(
+                    backend=backend,
+                    persist_dir=self.persist_dir,
+                    embeddings=embeddings
+                )
+        return self._stores[backend]
     
+    def get_deduplicator(self, collection_name: str) -> MinHashDeduplicator:
+        """MinHash index over the chunks already stored in a collection
+
+        The index is kept between calls and rebuilt from the store when its
+        size no longer matches the collection (reset, or another writer).
+        """
+        store = self.get_store(collection_name)
+        deduplicator = self._dedup_indexes.get(collection_name)
+        if deduplicator is None or len(deduplicator) != store.count(collection_name):
+            deduplicator = MinHashDeduplicator(
+                threshold=settings.DEDUP_THRESHOLD,
+                num_perm=settings.DEDUP_NUM_PERM
+            )
+            existing = store.get_all(collection_name)
+            for chunk_id, text in zip(existing["ids"], existing["documents"]):
+                if text:
+                    deduplicator.add(chunk_id, text)
+            self._dedup_indexes[collection_name] = deduplicator
+        return deduplicator
+
+    def estimate_embedding_seconds(self, store: VectorStore, chunks: int) -> float:
+        """Estimated seconds the store would spend embedding `chunks` chunks
+
+        Uses the per-chunk cost the store measured while embedding the
+        chunks it stored, so nothing is embedded just for the estimate.
+        Returns 0.0 until the store has embedded something.
+        """
+        return round((store.embedding_seconds_per_chunk or 0.0) * chunks, 2)
+
     def process_and_store_document(
         self, file_path: str, collection_name: str = "collections",
         reset_collection: bool = False
     ) -> Dict: 
-        """Create chunks > convert to embeddings > store in ChromaDB"""
+        """Create chunks > convert to embeddings > store in the vector store"""
         logger.info(f"Processing document: {file_path}")
         try:
             if not validate_collection_name(collection_name):
                 raise ValueError(
                     f"Collection name must be 3-63 characters long. Cannot start or end with : numbers, underscores, hyphens"
                 )
+            store = self.get_store(collection_name)
+
             # Reset collection 
             if reset_collection: 
-                try:
-                    self.db_client.delete_collection(name=collection_name)
+                if store.delete_collection(collection_name):
                     logger.info(f"Deleting existing collection: {collection_name}")
-                except Exception:
+                else:
                     logger.warning(f"Could not delete collection: {collection_name}, moving forward ...")
 
-            # Get or create a collection
-            collection = self.db_client.get_or_create_collection(name=collection_name)
-
             # Parser pdf 
             raw_documents = self.pdf_parser.extract_clean_text(
                 file_path=[file_path]
@@ -85,80 +154,183 @@ class DocumentProcessor:
                 logger.error(f"No content found in document")
                 return {"error": "empty document"}
             
-            # Create document object
+            # Create document object, one per page, carrying the section
+            # and chapter that are in effect at the top of the page
             documents = []
-            for doc in raw_documents:
+            page_headings = {}
+            section, chapter = "", ""
+            for page, doc in enumerate(raw_documents, start=1):
+                headings = extract_headings(doc.text)
+                page_headings[page] = headings
                 documents.append(
                     Document(
                         page_content=doc.text,
-                        metadata={"source": file_path}
+                        metadata={
+                            "source": file_path,
+                            "page": page,
+                            "section": section,
+                            "chapter": chapter
+                        }
                     )
                 )
+                section, chapter = apply_headings(
+                    headings, len(doc.text), section, chapter
+                )
 
             # Split into chunks 
             chunks = self.text_splitter.split_documents(documents=documents)
 
-            # Prepare data for ChromaDB
+            # Prepare data for the vector store
             texts = []
             metadatas = []
             ids = []
+            skipped_texts = []
+            deduplicator = (
+                self.get_deduplicator(collection_name) if settings.DEDUP_ENABLED else None
+            )
             
             for i, chunk in enumerate(chunks):
                 # Cleaned text content
                 clean_content = clean_text(chunk.page_content)
                 if not clean_content:
                     continue
+                chunk_id = f"Chunk_{i}_{Path(file_path).stem}"
+                # Skip near-duplicates of stored or earlier incoming chunks
+                if deduplicator and deduplicator.add_if_unique(chunk_id, clean_content):
+                    skipped_texts.append(clean_content)
+                    continue
+                page = chunk.metadata["page"]
+                section, chapter = apply_headings(
+                    page_headings[page],
+                    chunk.metadata.get("start_index", 0),
+                    chunk.metadata["section"],
+                    chunk.metadata["chapter"]
+                )
                 texts.append(clean_content)
                 metadatas.append({
                     "source": file_path,
-                    "chunk_ids": i
+                    "chunk_ids": i,
+                    "page": page,
+                    "section": section,
+                    "chapter": chapter
                 })
-                ids.append(f"Chunk_{i}_{Path(file_path).stem}")
+                ids.append(chunk_id)
+
+            if not texts and not skipped_texts:
+                return {"error": "No valid chunks created"}
 
             # Store in database
             if texts:
-                collection.add(
+                store.add(
+                    collection_name=collection_name,
                     documents=texts,
                     metadatas=metadatas,
                     ids=ids
                 )
 
-                return {
-                    "status": "success",
-                    "file_path": file_path,
-                    "chunks": len(chunks),
-                    "collection": collection_name
-                }
-            else:
-                return {"error": "No valid chunks created"}
+            embedding_seconds_saved = self.estimate_embedding_seconds(
+                store, len(skipped_texts)
+            )
+            if skipped_texts:
+                logger.info(
+                    f"Skipped {len(skipped_texts)} near-duplicate chunks, "
+                    f"saved ~{embedding_seconds_saved}s of embedding"
+                )
+
+            return {
+                "status": "success",
+                "file_path": file_path,
+                "chunks": len(chunks),
+                "stored_chunks": len(texts),
+                "duplicates_skipped": len(skipped_texts),
+                "embedding_seconds_saved": embedding_seconds_saved,
+                "collection": collection_name,
+                "backend": store.backend_name
+            }
             
         except Exception as e:
             logger.error(f"Document processing error: {str(e)}")
             return {"error": str(e)}
 
+    def rebuild_shard(self, shard: str, collection_name: str) -> List[Dict]:
+        """Clear one shard of a sharded collection and re-ingest its sources"""
+        store = self.get_store(collection_name)
+        if store.backend_name != "sharded":
+            raise ValueError(f"Collection {collection_name} is not sharded")
+
+        results = []
+        for source in store.clear_shard(shard, collection_name):
+            results.append(
+                self.process_and_store_document(
+                    file_path=source, collection_name=collection_name
+                )
+            )
+        return results
+
+    def export_collection(self, collection_name: str, path: str) -> Dict:
+        """Write a collection, embeddings included, to a Parquet snapshot"""
+        return export_store_snapshot(self.get_store(collection_name), collection_name, path)
+
+    def import_collection(
+        self,
+        path: str,
+        collection_name: Optional[str] = None,
+        reset_collection: bool = False
+    ) -> Dict:
+        """Bulk-load a Parquet snapshot into a collection
+
+        Stored embeddings are reused, so nothing is re-parsed or re-embedded.
+        The snapshot's checksum and embedding model are verified first.
+        """
+        logger.info(f"Importing snapshot: {path}")
+        try:
+            collection_name = collection_name or read_snapshot_info(path)["collection"]
+            report = import_store_snapshot(
+                self.get_store(collection_name), path, collection_name, reset_collection
+            )
+            return {"status": "success", **report}
+        except Exception as e:
+            logger.error(f"Snapshot import error: {str(e)}")
+            return {"error": str(e)}
+
+    def collection_version(self, collection_name: str) -> str:
+        """Version tag of a collection, used to tag cached results"""
+        return self.get_store(collection_name).collection_version(collection_name)
+
+    def list_sections(self, collection_name: str) -> List[str]:
+        """Distinct section headings of a collection, most chunks first"""
+        metadatas = self.get_store(collection_name).get_all(collection_name)["metadatas"]
+        counts: Dict[str, int] = {}
+        for metadata in metadatas:
+            section = (metadata or {}).get("section")
+            if section:
+                counts[section] = counts.get(section, 0) + 1
+        return sorted(counts, key=lambda section: -counts[section])
+
     def get_chunks(
-        self, query: str, collection_name: str, n_results: int = 5
+        self,
+        query: str,
+        collection_name: str,
+        n_results: int = 5,
+        where: Optional[Dict] = None
     ) -> List[Dict]:
+        """Retrieve the closest chunks for a query
+
+        Args:
+            where: Optional metadata filter (see `build_metadata_filter`),
+                applied inside the vector search
+        """
         try:
             logger.info(f"Getting chunks for {query}")
-            collection = self.db_client.get_or_create_collection(collection_name)
+            store = self.get_store(collection_name)
 
             # Query for chunks
-            results = collection.query(
-                query_texts=[query],
-                n_results=n_results
+            return store.query(
+                collection_name=collection_name,
+                query=query,
+                n_results=n_results,
+                where=where
             )
-
-            # Format results
-            chunks = []
-            for doc, metadata in zip(results['documents'][0], results['metadatas'][0]):
-                if doc: # Skip empty chunks
-                    chunks.append({
-                        "content": doc, 
-                        "metadata": metadata
-                    })
-
-            return chunks
         
         except Exception as e:
             logger.error(f"Error retrieving chunks: {str(e)}")
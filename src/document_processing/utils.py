@@ -1,4 +1,9 @@
+import re
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+CHAPTER_PATTERN = re.compile(r"^(?:chapter|unit)\s+([0-9ivxlc]+)\b", re.IGNORECASE)
 
 def clean_text(text: str) -> str:
     """Clean text content for chunking"""
@@ -8,7 +13,6 @@ def clean_text(text: str) -> str:
 
 def validate_collection_name(name: str):
     """Validate collection name for ChromaDB"""
-    import re
     # Check length (3-63 characters)
     if not (3 <= len(name) <= 63):
         return False
@@ -19,3 +23,62 @@ def validate_collection_name(name: str):
         return False
         
     return True
+
+
+def extract_headings(text: str) -> List[Tuple[int, int, str]]:
+    """Find markdown headings in text
+
+    Returns:
+        List of (offset, level, title) tuples in document order
+    """
+    return [
+        (match.start(), len(match.group(1)), match.group(2).strip())
+        for match in HEADING_PATTERN.finditer(text)
+    ]
+
+
+def parse_chapter(title: str) -> Optional[str]:
+    """Return the chapter number from a heading like 'Chapter 3: Motion'"""
+    match = CHAPTER_PATTERN.match(title.strip("*_ "))
+    return match.group(1).lower() if match else None
+
+
+def apply_headings(
+    headings: List[Tuple[int, int, str]],
+    until: int,
+    section: str,
+    chapter: str
+) -> Tuple[str, str]:
+    """Advance the (section, chapter) state over headings before `until`"""
+    for offset, _, title in headings:
+        if offset > until:
+            break
+        section = title
+        chapter = parse_chapter(title) or chapter
+    return section, chapter
+
+
+def build_metadata_filter(
+    source: Optional[str] = None,
+    chapter: Optional[str] = None,
+    section: Optional[str] = None,
+    pages: Optional[Tuple[int, int]] = None
+) -> Optional[Dict]:
+    """Build a `where` filter for scoped retrieval
+
+    Args:
+        source: Only search chunks from this file
+        chapter: Only search chunks from this chapter, e.g. "3"
+        section: Only search chunks under this section heading
+        pages: Inclusive (first, last) page range
+    """
+    where = {}
+    if source is not None:
+        where["source"] = source
+    if chapter is not None:
+        where["chapter"] = str(chapter).lower()
+    if section is not None:
+        where["section"] = section
+    if pages is not None:
+        where["page"] = {"$gte": pages[0], "$lte": pages[1]}
+    return where or None
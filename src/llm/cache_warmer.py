@@ -0,0 +1,126 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from src.utils.cache import ResponseCache
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class CacheWarmer:
+    """Precompute explanations for known topics ahead of student traffic
+
+    Running `LLMHandler.explain_topic` for each topic fills all serving
+    caches at once: query variants, retrieved chunk sets and the final
+    answer, each tagged with the collection version so re-ingesting the
+    collection invalidates them.
+    """
+
+    def __init__(self, llm_handler, max_workers: int = 2):
+        """Initialize with an LLMHandler wired to a ResponseCache"""
+        if llm_handler.cache is None:
+            raise ValueError("CacheWarmer needs an LLMHandler with a response cache")
+        self.llm_handler = llm_handler
+        self.cache = llm_handler.cache
+        self.retriever = llm_handler.context_builder.retriever
+        self.max_workers = max_workers
+
+    def derive_topics(self, collection_name: str, limit: Optional[int] = None) -> List[str]:
+        """Topics from a collection's section headings, largest sections first"""
+        sections = self.retriever.document_processor.list_sections(collection_name)
+        return sections[:limit] if limit else sections
+
+    def _is_cached(self, topic: str, collection_name: str, use_multi_query: bool) -> bool:
+        key = ResponseCache.make_key(topic, collection_name, use_multi_query)
+        version = self.retriever.cache_version(collection_name)
+        return self.cache.contains("explanation", key, version)
+
+    def _warm_topic(self, topic: str, collection_name: str, use_multi_query: bool) -> Dict:
+        if self._is_cached(topic, collection_name, use_multi_query):
+            return {"topic": topic, "status": "cached"}
+
+        start = time.perf_counter()
+        try:
+            self.llm_handler.explain_topic(
+                topic=topic,
+                collection_name=collection_name,
+                use_multi_query=use_multi_query
+            )
+        except Exception as e:
+            logger.error(f"Warming failed for {topic}: {str(e)}")
+        seconds = time.perf_counter() - start
+
+        # Only successful answers are cached, so check rather than assume
+        status = "warmed" if self._is_cached(topic, collection_name, use_multi_query) else "failed"
+        return {"topic": topic, "status": status, "seconds": seconds}
+
+    def warm(
+        self,
+        collection_name: str,
+        topics: Optional[List[str]] = None,
+        use_multi_query: bool = True,
+        limit: Optional[int] = None
+    ) -> Dict:
+        """Warm caches for a topic list, or for the collection's sections
+
+        Returns:
+            Report with coverage and the estimated first-request latency
+            saved (the time each newly warmed topic took to compute)
+        """
+        if topics is None:
+            topics = self.derive_topics(collection_name, limit=limit)
+        topics = list(dict.fromkeys(t.strip() for t in topics if t.strip()))
+        logger.info(f"Warming {len(topics)} topics for {collection_name}")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(
+                lambda topic: self._warm_topic(topic, collection_name, use_multi_query),
+                topics
+            ))
+
+        warmed = [r for r in results if r["status"] == "warmed"]
+        cached = [r for r in results if r["status"] == "cached"]
+        failed = [r["topic"] for r in results if r["status"] == "failed"]
+        seconds_saved = sum(r["seconds"] for r in warmed)
+
+        return {
+            "collection": collection_name,
+            "collection_version": self.retriever.cache_version(collection_name),
+            "topics": len(topics),
+            "warmed": len(warmed),
+            "already_cached": len(cached),
+            "failed": failed,
+            "coverage": round((len(warmed) + len(cached)) / len(topics), 3) if topics else 0.0,
+            "estimated_latency_saved_seconds": round(seconds_saved, 2),
+            "avg_cold_latency_seconds": round(seconds_saved / len(warmed), 2) if warmed else None
+        }
+
+
+def main():
+    from src.main import initialize_components
+
+    parser = argparse.ArgumentParser(description="Warm serving caches for a collection")
+    parser.add_argument("--collection", required=True, help="Collection to warm")
+    parser.add_argument(
+        "--topics", help="File with one topic per line; defaults to the collection's sections"
+    )
+    parser.add_argument("--limit", type=int, help="Max topics derived from sections")
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent topics")
+    args = parser.parse_args()
+
+    topics = None
+    if args.topics:
+        with open(args.topics, "r", encoding="utf-8") as f:
+            topics = f.read().splitlines()
+
+    components = initialize_components()
+    warmer = CacheWarmer(components["llm_handler"], max_workers=args.workers)
+    report = warmer.warm(args.collection, topics=topics, limit=args.limit)
+    print(json.dumps(report, indent=2))
+
+
+# Example usage: python -m src.llm.cache_warmer --collection ncert --topics topics.txt
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,8 @@ class ContextBuilder:
         query: str,
         collection_name: str,
         max_chunks: Optional[int] = None,
-        use_multi_query: bool = True
+        use_multi_query: bool = True,
+        where: Optional[Dict] = None
     ) -> str:
         if max_chunks is None:
             max_chunks = self.max_chunks
@@ -31,13 +32,15 @@ class ContextBuilder:
                     question=query,
                     collection_name=collection_name,
                     chunks_per_query=max_chunks,
-                    deduplicate=True
+                    deduplicate=True,
+                    where=where
                 )
             else:
                 chunks = self.retriever.document_processor.get_chunks(
                     query=query,
                     collection_name=collection_name,
-                    n_results=max_chunks
+                    n_results=max_chunks,
+                    where=where
                 )
             if not chunks:
                 logger.warning(f"No chunks found for query: {query}")
@@ -63,7 +66,8 @@ class ContextBuilder:
         
     
     def get_explanation_context(
-        self, topic: str, collection_name: str,  use_multi_query: bool = True
+        self, topic: str, collection_name: str,  use_multi_query: bool = True,
+        where: Optional[Dict] = None
     ) -> str:
         """Get context specifically for explanation prompts"""
 
@@ -71,6 +75,7 @@ class ContextBuilder:
             query=topic,
             collection_name=collection_name,
             use_multi_query=True,
-            max_chunks=self.max_chunks + 2
+            max_chunks=self.max_chunks + 2,
+            where=where
         )
             
@@ -5,6 +5,7 @@ from src.llm.prompts import GENERATE_EXPLANATION_PROMPT
 from src.utils.logger import get_logger
 from src.config.settings import get_settings
 from src.utils.exceptions import ContextError, LLMError
+from src.utils.cache import ResponseCache
 
 settings = get_settings()
 logger = get_logger()
@@ -13,7 +14,7 @@ logger = get_logger()
 class LLMHandler:
     """Main class to handle LLM calls"""
 
-    def __init__(self, context_builder):
+    def __init__(self, context_builder, cache: Optional[ResponseCache] = None):
         """Initialize LLMHandler object"""
         self.client = Client(
             host=settings.OLLAMA_HOST,
@@ -21,6 +22,7 @@ class LLMHandler:
         self.model = settings.LLM_MODEL
         self.temperature = settings.LLM_TEMPERATURE
         self.context_builder = context_builder
+        self.cache = cache
 
     def _make_request(
         self, prompt: str, temperature: Optional[float] = None
@@ -50,6 +52,13 @@ class LLMHandler:
         use_multi_query: bool = True
     ) -> str:
         """Generate explanation for give topic and context"""
+        if self.cache:
+            key = ResponseCache.make_key(topic, collection_name, use_multi_query)
+            version = self.context_builder.retriever.cache_version(collection_name)
+            cached = self.cache.get("explanation", key, version)
+            if cached is not None:
+                return cached
+
         # Get context for the topic
         context = self.context_builder.get_explanation_context(
             topic=topic,
@@ -64,10 +73,13 @@ class LLMHandler:
         # logger.info(f"Generated prompt: {prompt}")
         try: 
             # Make request to LLM   
-            return self._make_request(
+            answer = self._make_request(
                 prompt=prompt,
                 temperature=0.5
             )
+            if self.cache:
+                self.cache.set("explanation", key, version, answer)
+            return answer
         except ContextError as e:
             logger.error(f"Context error: {str(e)}")
             return f"I encountered an issue retrieving information: {str(e)}"
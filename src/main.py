@@ -2,29 +2,38 @@ from src.document_processing.processor import DocumentProcessor
 from src.retrieval.enhanced_retriever import EnhancedRetriever
 from src.llm.context_builder import ContextBuilder
 from src.llm.handler import LLMHandler
+from src.utils.cache import ResponseCache
 from src.utils.logger import get_logger
+from src.config.settings import get_settings
 
 logger = get_logger()
+settings = get_settings()
 
 def initialize_components():
     """Initialize all components for the application"""
     # Initialize document processor
     processor = DocumentProcessor(persist_dir="db")
+
+    # Shared cache for query variants, retrievals and answers
+    cache = None
+    if settings.RESPONSE_CACHE_ENABLED:
+        cache = ResponseCache(settings.RESPONSE_CACHE_PATH)
     
     # Initialize enhanced retriever
-    retriever = EnhancedRetriever(document_processor=processor)
+    retriever = EnhancedRetriever(document_processor=processor, cache=cache)
     
     # Initialize context builder
     context_builder = ContextBuilder(enhanced_retriever=retriever)
     
     # Initialize LLM handler
-    llm_handler = LLMHandler(context_builder=context_builder)
+    llm_handler = LLMHandler(context_builder=context_builder, cache=cache)
     
     return {
         "processor": processor,
         "retriever": retriever,
         "context_builder": context_builder,
-        "llm_handler": llm_handler
+        "llm_handler": llm_handler,
+        "cache": cache
     }
 
 def process_document(processor, file_path, collection_name, reset=False):
@@ -5,6 +5,7 @@ from langchain_ollama import ChatOllama
 from src.config.settings import get_settings
 from src.utils.logger import get_logger
 from src.llm.prompts import TEMPLATE
+from src.utils.cache import ResponseCache
 
 settings = get_settings()
 logger = get_logger()
@@ -12,9 +13,10 @@ logger = get_logger()
 class EnhancedRetriever:
     """Enhanced retrieval using multi-query generation"""
 
-    def __init__(self, document_processor):
-        """Initialize with document processor"""
+    def __init__(self, document_processor, cache: Optional[ResponseCache] = None):
+        """Initialize with document processor and optional response cache"""
         self.document_processor = document_processor
+        self.cache = cache
         self.llm = ChatOllama(
             model=settings.LLM_MODEL,
             temperature=settings.LLM_TEMPERATURE,
@@ -35,6 +37,11 @@ class EnhancedRetriever:
 
     def generate_query_variants(self, question: str) -> List[str]:
         """Generate different version of the questions"""
+        key = ResponseCache.make_key(question)
+        if self.cache:
+            cached = self.cache.get("variants", key, settings.LLM_MODEL)
+            if cached is not None:
+                return cached
         try:
             logger.info(f"Generating variants for the original question")
             variants = self.generate_queries.invoke(question)
@@ -44,6 +51,8 @@ class EnhancedRetriever:
 
             # logger.info(f"Generated query variants: {variants}")
 
+            if self.cache:
+                self.cache.set("variants", key, settings.LLM_MODEL, variants)
             return variants
         except Exception as e:
             logger.error(f"Error generating query variants: {str(e)}")
@@ -55,9 +64,24 @@ class EnhancedRetriever:
         question: str,
         collection_name: str,
         chunks_per_query: int = 3,
-        deduplicate: bool = True
+        deduplicate: bool = True,
+        where: Optional[Dict] = None
     ) -> List[Dict]:
-        """Retrieve chunks using multiquery variants"""
+        """Retrieve chunks using multiquery variants
+
+        Args:
+            where: Optional metadata filter (source, chapter, section, page)
+                that scopes every variant's search
+        """
+        if self.cache:
+            key = ResponseCache.make_key(
+                question, collection_name, chunks_per_query, deduplicate, where
+            )
+            version = self.cache_version(collection_name)
+            cached = self.cache.get("retrieval", key, version)
+            if cached is not None:
+                return cached
+
         # Generate query variants
         # Generate query variants
         query_variants = self.generate_query_variants(question)
@@ -70,7 +94,8 @@ class EnhancedRetriever:
             chunks = self.document_processor.get_chunks(
                 query=query,
                 collection_name=collection_name,
-                n_results=chunks_per_query
+                n_results=chunks_per_query,
+                where=where
             )
             
             for chunk in chunks:
@@ -87,5 +112,14 @@ class EnhancedRetriever:
                 chunk["metadata"] = chunk_metadata
                 
                 all_chunks.append(chunk)
-        
-        return all_chunks
\ No newline at end of file
+
+        if self.cache:
+            self.cache.set("retrieval", key, version, all_chunks)
+        return all_chunks
+
+    def cache_version(self, collection_name: str) -> str:
+        """Version tag for cached results derived from a collection"""
+        return (
+            f"{self.document_processor.collection_version(collection_name)}"
+            f"|{settings.LLM_MODEL}"
+        )
\ No newline at end of file
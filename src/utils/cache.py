@@ -0,0 +1,70 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class ResponseCache:
+    """Versioned key/value cache shared by the serving path and warm-up jobs
+
+    Entries live in a SQLite file so a warm-up run in another process fills
+    the same cache the server reads. Every entry carries a version tag (for
+    example the collection version and model); a lookup with a different
+    tag is a miss, so re-ingesting a collection invalidates its entries.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable key from JSON-serializable parts"""
+        return json.dumps(parts, sort_keys=True, default=str)
+
+    def get(self, namespace: str, key: str, version: str) -> Optional[Any]:
+        """Cached value, or None on a miss or version mismatch"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM cache WHERE namespace = ? AND key = ? AND version = ?",
+                    (namespace, key, version)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            logger.warning(f"Cache read failed: {str(e)}")
+            return None
+
+    def set(self, namespace: str, key: str, version: str, value: Any):
+        """Store a value, replacing any older version of the entry"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                    (namespace, key, version, json.dumps(value), time.time())
+                )
+                self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Cache write failed: {str(e)}")
+
+    def contains(self, namespace: str, key: str, version: str) -> bool:
+        return self.get(namespace, key, version) is not None
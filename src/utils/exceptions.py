@@ -12,4 +12,8 @@ class LLMError(TeachingAssistantError):
 
 class ContextError(TeachingAssistantError):
     """Raised when context retrieval fails"""
+    pass
+
+class SnapshotError(TeachingAssistantError):
+    """Raised when a collection snapshot is unreadable, corrupt or incompatible"""
     pass
\ No newline at end of file
@@ -0,0 +1,26 @@
+import os
+import sys
+from pathlib import Path
+import pytest
+
+# Make `src` importable and satisfy required settings without a .env file
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("LLAMA_CLOUD_API_KEY", "test-key")
+
+
+class KeywordEmbeddings:
+    """Deterministic embeddings: one dimension per known keyword"""
+
+    VOCAB = ["alpha", "beta", "gamma", "delta", "motion", "force", "energy", "light"]
+
+    def embed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(word)) for word in self.VOCAB]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+@pytest.fixture
+def embeddings():
+    return KeywordEmbeddings()
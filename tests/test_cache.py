@@ -0,0 +1,40 @@
+import pytest
+from src.utils.cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "cache" / "responses.sqlite"))
+
+
+def test_hit_requires_matching_version(cache):
+    cache.set("explanation", "motion", "v1", "answer")
+    assert cache.get("explanation", "motion", "v1") == "answer"
+    assert cache.get("explanation", "motion", "v2") is None
+    assert cache.get("retrieval", "motion", "v1") is None
+
+
+def test_new_version_replaces_entry(cache):
+    cache.set("explanation", "motion", "v1", "old")
+    cache.set("explanation", "motion", "v2", "new")
+    assert cache.get("explanation", "motion", "v1") is None
+    assert cache.get("explanation", "motion", "v2") == "new"
+
+
+def test_values_round_trip_as_json(cache):
+    chunks = [{"id": "c1", "content": "text", "metadata": {"page": 3}, "distance": 0.1}]
+    cache.set("retrieval", "key", "v1", chunks)
+    assert cache.get("retrieval", "key", "v1") == chunks
+    assert cache.contains("retrieval", "key", "v1")
+
+
+def test_entries_are_shared_through_the_file(cache):
+    cache.set("variants", "key", "v1", ["a", "b"])
+    assert ResponseCache(cache.path).get("variants", "key", "v1") == ["a", "b"]
+
+
+def test_make_key_is_stable():
+    assert ResponseCache.make_key("q", {"b": 1, "a": 2}) == ResponseCache.make_key(
+        "q", {"a": 2, "b": 1}
+    )
+    assert ResponseCache.make_key("q", True) != ResponseCache.make_key("q", False)
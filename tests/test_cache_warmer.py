@@ -0,0 +1,92 @@
+import pytest
+from src.llm.cache_warmer import CacheWarmer
+from src.utils.cache import ResponseCache
+
+
+class FakeProcessor:
+    def list_sections(self, collection_name):
+        return ["Motion", "Energy", "Light"]
+
+
+class FakeRetriever:
+    def __init__(self):
+        self.document_processor = FakeProcessor()
+        self.version = "v1"
+
+    def cache_version(self, collection_name):
+        return self.version
+
+
+class FakeContextBuilder:
+    def __init__(self):
+        self.retriever = FakeRetriever()
+
+
+class FakeHandler:
+    """Caches answers like LLMHandler.explain_topic, except for failing topics"""
+
+    def __init__(self, cache, failing=()):
+        self.cache = cache
+        self.context_builder = FakeContextBuilder()
+        self.failing = set(failing)
+        self.calls = []
+
+    def explain_topic(self, topic, collection_name, use_multi_query=True):
+        self.calls.append(topic)
+        if topic in self.failing:
+            raise ConnectionError("LLM unavailable")
+        key = ResponseCache.make_key(topic, collection_name, use_multi_query)
+        version = self.context_builder.retriever.cache_version(collection_name)
+        self.cache.set("explanation", key, version, f"About {topic}")
+        return f"About {topic}"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "responses.sqlite"))
+
+
+def test_warm_reports_coverage(cache):
+    handler = FakeHandler(cache, failing={"Light"})
+    report = CacheWarmer(handler).warm("physics")
+
+    assert sorted(handler.calls) == ["Energy", "Light", "Motion"]
+    assert report["topics"] == 3
+    assert report["warmed"] == 2
+    assert report["already_cached"] == 0
+    assert report["failed"] == ["Light"]
+    assert report["coverage"] == 0.667
+    assert report["collection_version"] == "v1"
+
+
+def test_second_run_uses_cache_until_version_changes(cache):
+    handler = FakeHandler(cache)
+    warmer = CacheWarmer(handler)
+    warmer.warm("physics", topics=["Motion", "Energy"])
+
+    handler.calls.clear()
+    report = warmer.warm("physics", topics=["Motion", "Energy", " Motion ", ""])
+    assert handler.calls == []
+    assert report["topics"] == 2
+    assert report["already_cached"] == 2
+    assert report["coverage"] == 1.0
+    assert report["avg_cold_latency_seconds"] is None
+
+    # Re-ingesting the collection changes its version
+    handler.context_builder.retriever.version = "v2"
+    report = warmer.warm("physics", topics=["Motion", "Energy"])
+    assert sorted(handler.calls) == ["Energy", "Motion"]
+    assert report["warmed"] == 2
+    assert report["already_cached"] == 0
+
+
+def test_limit_applies_to_derived_topics(cache):
+    handler = FakeHandler(cache)
+    report = CacheWarmer(handler).warm("physics", limit=1)
+    assert handler.calls == ["Motion"]
+    assert report["topics"] == 1
+
+
+def test_requires_a_cache():
+    with pytest.raises(ValueError):
+        CacheWarmer(FakeHandler(cache=None))
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from src.document_processing.dedup import MinHashDeduplicator, _choose_bands
+
+BASE = " ".join(f"word{i}" for i in range(150))
+
+
+@pytest.fixture
+def deduplicator():
+    deduplicator = MinHashDeduplicator(threshold=0.85)
+    assert deduplicator.add_if_unique("base", BASE) is None
+    return deduplicator
+
+
+def test_exact_duplicate_is_detected(deduplicator):
+    assert deduplicator.add_if_unique("copy", BASE) == "base"
+    assert len(deduplicator) == 1
+
+
+def test_near_duplicate_above_threshold_is_detected(deduplicator):
+    # One changed word touches 5 of ~146 shingles, Jaccard ~0.93
+    near = BASE.replace("word70 ", "changed ")
+    assert deduplicator.add_if_unique("near", near) == "base"
+
+
+def test_text_below_threshold_is_kept(deduplicator):
+    # Half the words shared, Jaccard ~0.3
+    overlapping = " ".join(f"word{i}" for i in range(75, 225))
+    assert deduplicator.add_if_unique("overlap", overlapping) is None
+    assert deduplicator.add_if_unique("other", "an entirely different paragraph of text") is None
+    assert len(deduplicator) == 3
+
+
+def _pairs_near_threshold(deduplicator, changes, low, high, count=100):
+    """(base, variant) texts differing in `changes` words whose exact
+    shingle Jaccard is in [low, high]"""
+    generator = np.random.RandomState(7)
+    pairs = []
+    while len(pairs) < count:
+        words = [f"w{i}" for i in generator.randint(0, 10000, size=200)]
+        variant = list(words)
+        for position in generator.choice(200, size=changes, replace=False):
+            variant[position] = f"x{generator.randint(0, 10000)}"
+        base, variant = " ".join(words), " ".join(variant)
+        similarity = deduplicator.jaccard(
+            deduplicator.shingle_hashes(base), deduplicator.shingle_hashes(variant)
+        )
+        if low <= similarity <= high:
+            pairs.append((base, variant))
+    return pairs
+
+
+def test_pairs_just_above_threshold_are_detected():
+    probe = MinHashDeduplicator(threshold=0.85)
+    pairs = _pairs_near_threshold(probe, 3, 0.855, 0.875)
+
+    detected = 0
+    for i, (base, variant) in enumerate(pairs):
+        deduplicator = MinHashDeduplicator(threshold=0.85)
+        deduplicator.add(f"base{i}", base)
+        detected += deduplicator.find_duplicate(variant) is not None
+    assert detected >= 0.95 * len(pairs)
+
+
+def test_pairs_just_below_threshold_are_kept():
+    probe = MinHashDeduplicator(threshold=0.85)
+    for base, variant in _pairs_near_threshold(probe, 4, 0.80, 0.845, count=20):
+        deduplicator = MinHashDeduplicator(threshold=0.85)
+        deduplicator.add("base", base)
+        assert deduplicator.find_duplicate(variant) is None
+
+
+def test_bands_favour_recall_at_threshold():
+    bands, rows = _choose_bands(128, 0.85)
+    assert bands * rows <= 128
+    # Probability that a pair at the threshold becomes a candidate
+    assert 1.0 - (1.0 - 0.85 ** rows) ** bands > 0.95
+
+
+def test_signatures_are_deterministic():
+    first, second = MinHashDeduplicator(), MinHashDeduplicator()
+    hashes = first.shingle_hashes(BASE)
+    assert (first.signature(hashes) == second.signature(hashes)).all()
+
+
+def test_invalid_threshold():
+    with pytest.raises(ValueError):
+        MinHashDeduplicator(threshold=0)
@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("ollama")
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_ollama")
+
+from src.llm.context_builder import ContextBuilder
+from src.llm.handler import LLMHandler
+from src.retrieval.enhanced_retriever import EnhancedRetriever
+from src.utils.cache import ResponseCache
+
+
+class FakeProcessor:
+    """Vector search stand-in that counts queries"""
+
+    def __init__(self):
+        self.version = "numpy:1:a"
+        self.queries = []
+
+    def collection_version(self, collection_name):
+        return self.version
+
+    def get_chunks(self, query, collection_name, n_results=5, where=None):
+        self.queries.append(query)
+        return [{"id": "c1", "content": "Force equals mass times acceleration.",
+                 "metadata": {"page": 1}, "distance": 0.1}]
+
+
+class FakeVariants:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, question):
+        self.calls += 1
+        return [f"{question} explained"]
+
+
+@pytest.fixture
+def processor():
+    return FakeProcessor()
+
+
+@pytest.fixture
+def retriever(tmp_path, processor):
+    retriever = EnhancedRetriever(
+        processor, cache=ResponseCache(str(tmp_path / "responses.sqlite"))
+    )
+    retriever.generate_queries = FakeVariants()
+    return retriever
+
+
+@pytest.fixture
+def handler(retriever, monkeypatch):
+    handler = LLMHandler(ContextBuilder(retriever), cache=retriever.cache)
+    handler.requests = []
+    monkeypatch.setattr(
+        handler, "_make_request",
+        lambda prompt, temperature=None: handler.requests.append(prompt) or "Answer"
+    )
+    return handler
+
+
+def test_retrieval_is_served_from_cache(retriever, processor):
+    first = retriever.retrieve_with_multi_query("force", "physics")
+    queries = len(processor.queries)
+    assert retriever.retrieve_with_multi_query("force", "physics") == first
+    assert len(processor.queries) == queries
+    assert retriever.generate_queries.calls == 1
+
+
+def test_retrieval_cache_is_scoped_by_filter(retriever, processor):
+    retriever.retrieve_with_multi_query("force", "physics")
+    queries = len(processor.queries)
+    retriever.retrieve_with_multi_query("force", "physics", where={"page": 1})
+    assert len(processor.queries) > queries
+
+
+def test_explanation_is_served_from_cache(handler):
+    assert handler.explain_topic("force", "physics") == "Answer"
+    assert handler.explain_topic("force", "physics") == "Answer"
+    assert len(handler.requests) == 1
+
+
+def test_new_collection_version_invalidates_explanation(handler, processor):
+    handler.explain_topic("force", "physics")
+    processor.version = "numpy:1:b"
+    handler.explain_topic("force", "physics")
+    assert len(handler.requests) == 2
@@ -0,0 +1,82 @@
+import pytest
+from src.database.vector_store import to_chroma_where
+from src.document_processing.utils import (
+    extract_headings, parse_chapter, apply_headings, build_metadata_filter
+)
+
+PAGES = [
+    "# Chapter 1: Motion\nIntro text.\n## Newton's Laws\nFirst law.",
+    "More about the first law, no headings on this page.",
+    "Still Newton.\n# Unit 2 Energy\nWork and power.",
+]
+
+
+def test_extract_headings():
+    assert extract_headings(PAGES[0]) == [
+        (0, 1, "Chapter 1: Motion"),
+        (32, 2, "Newton's Laws"),
+    ]
+    assert extract_headings(PAGES[1]) == []
+    # Trailing hashes are not part of the title
+    assert extract_headings("### Summary ###") == [(0, 3, "Summary")]
+
+
+@pytest.mark.parametrize("title, chapter", [
+    ("Chapter 3: Motion", "3"),
+    ("Chapter III", "iii"),
+    ("**Unit 3** Waves", "3"),
+    ("UNIT iv", "iv"),
+    ("Chapters of history", None),
+    ("Introduction", None),
+])
+def test_parse_chapter(title, chapter):
+    assert parse_chapter(title) == chapter
+
+
+def test_section_and_chapter_carry_across_pages():
+    # Same walk as DocumentProcessor: state at the top of each page
+    section, chapter = "", ""
+    states = []
+    for text in PAGES:
+        states.append((section, chapter))
+        section, chapter = apply_headings(extract_headings(text), len(text), section, chapter)
+
+    assert states == [
+        ("", ""),
+        ("Newton's Laws", "1"),
+        ("Newton's Laws", "1"),
+    ]
+    assert (section, chapter) == ("Unit 2 Energy", "2")
+
+
+def test_headings_are_applied_by_chunk_start_index():
+    headings = extract_headings(PAGES[0])
+    state = ("Previous", "0")
+    assert apply_headings(headings, 0, *state) == ("Chapter 1: Motion", "1")
+    assert apply_headings(headings, 31, *state) == ("Chapter 1: Motion", "1")
+    # A chunk starting at the second heading already belongs to it
+    assert apply_headings(headings, 32, *state) == ("Newton's Laws", "1")
+    assert apply_headings([], 100, *state) == state
+
+
+def test_build_metadata_filter():
+    assert build_metadata_filter() is None
+    assert build_metadata_filter(source="a.pdf") == {"source": "a.pdf"}
+    assert build_metadata_filter(chapter="III", pages=(3, 7)) == {
+        "chapter": "iii",
+        "page": {"$gte": 3, "$lte": 7},
+    }
+    assert build_metadata_filter(chapter=2)["chapter"] == "2"
+
+
+def test_to_chroma_where():
+    assert to_chroma_where(None) is None
+    assert to_chroma_where({"source": "a.pdf"}) == {"source": {"$eq": "a.pdf"}}
+    # Chroma allows one operator per clause, so ranges become an $and
+    assert to_chroma_where(build_metadata_filter(source="a.pdf", pages=(3, 7))) == {
+        "$and": [
+            {"source": {"$eq": "a.pdf"}},
+            {"page": {"$gte": 3}},
+            {"page": {"$lte": 7}},
+        ]
+    }
@@ -0,0 +1,123 @@
+import json
+import numpy as np
+import pytest
+from src.database.numpy_store import NumpyVectorStore
+
+DOCUMENTS = ["alpha alpha", "beta", "gamma motion", "force energy", "light alpha"]
+METADATAS = [
+    {"source": "a.pdf", "page": 1},
+    {"source": "a.pdf", "page": 2},
+    {"source": "b.pdf", "page": 1},
+    {"source": "b.pdf", "page": 3},
+    {"source": "b.pdf", "page": 4},
+]
+IDS = [f"chunk_{i}" for i in range(len(DOCUMENTS))]
+
+
+@pytest.fixture
+def store(tmp_path, embeddings):
+    store = NumpyVectorStore(persist_dir=str(tmp_path), embeddings=embeddings)
+    store.add("books", DOCUMENTS, METADATAS, IDS)
+    return store
+
+
+def test_query_returns_closest_first(store):
+    results = store.query("books", "alpha", n_results=2)
+    assert [r["id"] for r in results] == ["chunk_0", "chunk_4"]
+    assert results[0]["distance"] == pytest.approx(0.0, abs=1e-6)
+    assert results[0]["content"] == "alpha alpha"
+
+
+def test_add_skips_existing_ids(store):
+    assert store.add("books", ["beta beta"], [{"source": "c.pdf"}], ["chunk_1"]) == 0
+    assert store.count("books") == len(DOCUMENTS)
+
+
+def test_equality_filter(store):
+    results = store.query("books", "alpha", n_results=5, where={"source": "a.pdf"})
+    assert {r["id"] for r in results} == {"chunk_0", "chunk_1"}
+
+
+def test_range_and_combined_filters(store):
+    where = {"source": "b.pdf", "page": {"$gte": 3, "$lte": 4}}
+    results = store.query("books", "alpha", n_results=5, where=where)
+    assert {r["id"] for r in results} == {"chunk_3", "chunk_4"}
+    assert results[0]["id"] == "chunk_4"
+
+
+def test_filter_without_matches_returns_nothing(store):
+    assert store.query("books", "alpha", where={"source": "missing.pdf"}) == []
+
+
+def test_reopened_store_sees_persisted_data(store, tmp_path, embeddings):
+    reopened = NumpyVectorStore(persist_dir=str(tmp_path), embeddings=embeddings)
+    assert reopened.count("books") == len(DOCUMENTS)
+    assert reopened.query("books", "force", n_results=1)[0]["id"] == "chunk_3"
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_dtype_round_trip(tmp_path, embeddings, dtype):
+    store = NumpyVectorStore(persist_dir=str(tmp_path), embeddings=embeddings, dtype=dtype)
+    store.add("books", DOCUMENTS, METADATAS, IDS)
+
+    stored = store.get_all("books", include_embeddings=True)["embeddings"]
+    expected = np.asarray(embeddings.embed_documents(DOCUMENTS), dtype=np.float32)
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    np.testing.assert_allclose(stored, expected, atol=1e-2)
+
+    for i, document in enumerate(DOCUMENTS):
+        assert store.query("books", document, n_results=1)[0]["id"] == IDS[i]
+
+
+def test_mutating_query_results_does_not_change_stored_records(store, tmp_path):
+    result = store.query("books", "beta", n_results=1)[0]
+    result["metadata"]["query"] = "mutated"
+    store.get_all("books")["metadatas"][0]["query"] = "mutated"
+
+    store.add("books", ["delta"], [{"source": "c.pdf", "page": 1}], ["chunk_new"])
+
+    records_file = tmp_path / "numpy" / "books" / "records.json"
+    with open(records_file, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    assert all("query" not in metadata for metadata in records["metadatas"])
+    assert "query" not in store.query("books", "beta", n_results=1)[0]["metadata"]
+
+
+def test_delete_collection(store):
+    assert store.delete_collection("books") is True
+    assert store.count("books") == 0
+    assert store.delete_collection("books") is False
+
+
+def test_add_records_embedding_cost(tmp_path, embeddings):
+    store = NumpyVectorStore(persist_dir=str(tmp_path), embeddings=embeddings)
+    store.add("books", DOCUMENTS[:1], METADATAS[:1], IDS[:1], embeddings=[[1.0] * 8])
+    assert store.embedding_seconds_per_chunk is None
+
+    store.add("books", DOCUMENTS[1:], METADATAS[1:], IDS[1:])
+    assert store.embedding_seconds_per_chunk >= 0.0
+
+
+def test_delete_by_another_instance_clears_this_one(store, tmp_path, embeddings):
+    assert store.count("books") == len(DOCUMENTS)
+    other = NumpyVectorStore(persist_dir=str(tmp_path), embeddings=embeddings)
+    other.delete_collection("books")
+
+    assert store.count("books") == 0
+    assert store.query("books", "alpha") == []
+    assert store.get_all("books")["ids"] == []
+
+    other.add("books", ["delta"], [{"source": "c.pdf", "page": 1}], ["chunk_new"])
+    assert store.get_all("books")["ids"] == ["chunk_new"]
+
+
+def test_collection_version_changes_on_reset_with_same_content(store):
+    version = store.collection_version("books")
+    store.delete_collection("books")
+    store.add("books", DOCUMENTS, METADATAS, IDS)
+    assert store.count("books") == len(DOCUMENTS)
+    assert store.collection_version("books") != version
+
+
+def test_collection_version_stable_without_writes(store):
+    assert store.collection_version("books") == store.collection_version("books")
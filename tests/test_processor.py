@@ -0,0 +1,105 @@
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("langchain_huggingface")
+pytest.importorskip("llama_cloud_services")
+
+from src.config.settings import get_settings
+from src.document_processing.processor import DocumentProcessor
+
+PARAGRAPH = (
+    "Newton's first law states that an object at rest stays at rest and an "
+    "object in motion stays in motion unless acted upon by an external force."
+)
+OTHER = (
+    "Light travels in straight lines and its speed in vacuum is about three "
+    "hundred thousand kilometres per second, faster than anything else."
+)
+
+
+class Page:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeParser:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def extract_clean_text(self, file_path):
+        return [Page(text) for text in self.pages]
+
+
+@pytest.fixture
+def processor(tmp_path, embeddings, monkeypatch):
+    monkeypatch.setattr(get_settings(), "VECTOR_STORE_BACKEND", "numpy")
+    monkeypatch.setattr(get_settings(), "DEDUP_ENABLED", True)
+    processor = DocumentProcessor(persist_dir=str(tmp_path))
+    processor._embeddings = embeddings
+    return processor
+
+
+def test_near_duplicate_chunks_are_skipped(processor):
+    processor.pdf_parser = FakeParser([PARAGRAPH, OTHER, PARAGRAPH + " Indeed."])
+    result = processor.process_and_store_document("book.pdf", "physics")
+
+    assert result["status"] == "success"
+    assert result["stored_chunks"] == 2
+    assert result["duplicates_skipped"] == 1
+    assert isinstance(result["embedding_seconds_saved"], float)
+    assert processor.get_store("physics").count("physics") == 2
+
+
+def test_reingesting_reports_all_chunks_as_duplicates(processor):
+    processor.pdf_parser = FakeParser([PARAGRAPH, OTHER])
+    processor.process_and_store_document("book.pdf", "physics")
+
+    result = processor.process_and_store_document("book.pdf", "physics")
+    assert result["status"] == "success"
+    assert result["stored_chunks"] == 0
+    assert result["duplicates_skipped"] == 2
+    assert isinstance(result["embedding_seconds_saved"], float)
+
+
+def test_skipped_chunks_are_not_embedded(processor, embeddings, monkeypatch):
+    embedded = []
+    embed_documents = embeddings.embed_documents
+    monkeypatch.setattr(
+        embeddings, "embed_documents",
+        lambda texts: embedded.extend(texts) or embed_documents(texts)
+    )
+    processor.pdf_parser = FakeParser([PARAGRAPH, OTHER])
+    processor.process_and_store_document("book.pdf", "physics")
+    assert len(embedded) == 2
+
+    result = processor.process_and_store_document("book.pdf", "physics")
+    assert result["duplicates_skipped"] == 2
+    assert len(embedded) == 2
+
+
+def test_concurrent_first_use_creates_one_store(processor, monkeypatch):
+    import threading
+    import time
+    from src.document_processing import processor as processor_module
+
+    created = []
+    create_vector_store = processor_module.create_vector_store
+
+    def slow_create(**kwargs):
+        created.append(kwargs["backend"])
+        time.sleep(0.05)
+        return create_vector_store(**kwargs)
+
+    monkeypatch.setattr(processor_module, "create_vector_store", slow_create)
+    stores = []
+    threads = [
+        threading.Thread(target=lambda: stores.append(processor.get_store("physics")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert created == ["numpy"]
+    assert all(store is stores[0] for store in stores)
@@ -0,0 +1,124 @@
+import pytest
+from src.database.shard_router import ShardRouter
+
+
+@pytest.fixture
+def shard_dir(tmp_path):
+    return lambda name: str(tmp_path / name)
+
+
+@pytest.fixture
+def make_router(tmp_path, embeddings):
+    shards = {"s1": str(tmp_path / "s1"), "s2": str(tmp_path / "s2")}
+
+    def make_router():
+        return ShardRouter(
+            shards=shards, persist_dir=str(tmp_path), backend="numpy", embeddings=embeddings
+        )
+    return make_router
+
+
+def add_source(router, source, documents):
+    return router.add(
+        "books",
+        documents=documents,
+        metadatas=[{"source": source} for _ in documents],
+        ids=[f"{source}_{i}" for i in range(len(documents))]
+    )
+
+
+def test_sources_spread_across_shards(make_router):
+    router = make_router()
+    add_source(router, "a.pdf", ["alpha", "alpha beta"])
+    add_source(router, "b.pdf", ["gamma"])
+
+    assert router.route("books", "a.pdf") != router.route("books", "b.pdf")
+    results = router.query("books", "alpha gamma", n_results=3)
+    assert {r["shard"] for r in results} == {"s1", "s2"}
+    assert router.count("books") == 3
+
+
+def test_routes_from_two_routers_are_merged(make_router):
+    first, second = make_router(), make_router()
+    add_source(first, "a.pdf", ["alpha"])
+    add_source(second, "b.pdf", ["beta"])
+    add_source(first, "c.pdf", ["gamma"])
+
+    reloaded = make_router()
+    for source in ("a.pdf", "b.pdf", "c.pdf"):
+        assert reloaded.route("books", source) == first.route("books", source)
+
+
+def test_serving_router_sees_sources_ingested_elsewhere(make_router):
+    serving = make_router()
+    ingesting = make_router()
+    add_source(ingesting, "a.pdf", ["alpha"])
+
+    results = serving.query("books", "alpha", where={"source": "a.pdf"})
+    assert [r["id"] for r in results] == ["a.pdf_0"]
+
+
+def test_unknown_source_filter_fans_out(make_router):
+    router = make_router()
+    add_source(router, "a.pdf", ["alpha"])
+    # Route entry lost, but the chunks are still on a shard
+    with router._editing_table() as table:
+        table["routes"]["books"].clear()
+
+    results = router.query("books", "alpha", where={"source": "a.pdf"})
+    assert [r["id"] for r in results] == ["a.pdf_0"]
+
+
+def test_drop_shard_orphans_its_sources(make_router):
+    router = make_router()
+    add_source(router, "a.pdf", ["alpha"])
+    shard = router.route("books", "a.pdf")
+
+    assert router.drop_shard(shard, delete_data=True) == ["a.pdf"]
+    assert shard not in router.shards
+    assert router.sources_on_shard(shard, "books") == []
+
+
+def test_dropped_shard_stays_dropped_after_restart(make_router):
+    router = make_router()
+    add_source(router, "a.pdf", ["alpha"])
+    shard = router.route("books", "a.pdf")
+    router.drop_shard(shard)
+
+    restarted = make_router()
+    assert shard not in restarted.shards
+    assert restarted.query("books", "alpha") == []
+
+
+def test_shard_changes_reach_running_routers(make_router, shard_dir):
+    first, second = make_router(), make_router()
+    first.add_shard("s3", shard_dir("s3"))
+    # Shard changes are picked up on the next call
+    assert second.count("books") == 0
+    assert set(second.shards) == {"s1", "s2", "s3"}
+
+    # New sources go to the empty shard and are queried from every router
+    add_source(first, "a.pdf", ["alpha"])
+    add_source(first, "b.pdf", ["alpha beta"])
+    add_source(first, "c.pdf", ["alpha gamma"])
+    results = second.query("books", "alpha", n_results=3)
+    assert {r["shard"] for r in results} == {"s1", "s2", "s3"}
+
+    second.drop_shard("s3")
+    assert first.count("books") == 2
+    assert set(first.shards) == {"s1", "s2"}
+    assert set(make_router().shards) == {"s1", "s2"}
+
+
+def test_dropped_shard_can_be_added_back(make_router, shard_dir):
+    router = make_router()
+    router.drop_shard("s1")
+    router.add_shard("s1", shard_dir("s1"))
+    assert set(make_router().shards) == {"s1", "s2"}
+
+
+def test_last_shard_cannot_be_dropped(make_router):
+    router = make_router()
+    router.drop_shard("s1")
+    with pytest.raises(ValueError):
+        router.drop_shard("s2")
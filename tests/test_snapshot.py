@@ -0,0 +1,100 @@
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+from src.database.numpy_store import NumpyVectorStore
+from src.database.shard_router import ShardRouter
+from src.database.snapshot import export_store_snapshot, import_store_snapshot
+from src.utils.exceptions import SnapshotError
+
+DOCUMENTS = ["alpha beta", "gamma", "motion force energy", "light", "delta alpha"]
+METADATAS = [{"source": "a.pdf", "page": i} for i in range(len(DOCUMENTS))]
+IDS = [f"chunk_{i}" for i in range(len(DOCUMENTS))]
+
+
+def make_store(path, embeddings, dtype="float32"):
+    return NumpyVectorStore(persist_dir=str(path), embeddings=embeddings, dtype=dtype)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_round_trip_reproduces_vectors_and_results(tmp_path, embeddings, dtype):
+    source = make_store(tmp_path / "source", embeddings, dtype)
+    source.add("books", DOCUMENTS, METADATAS, IDS)
+    snapshot = tmp_path / "books.parquet"
+    export_store_snapshot(source, "books", str(snapshot))
+
+    target = make_store(tmp_path / "target", embeddings, dtype)
+    report = import_store_snapshot(target, str(snapshot))
+
+    assert report["chunks"] == len(DOCUMENTS)
+    source_data = source.get_all("books", include_embeddings=True)
+    target_data = target.get_all("books", include_embeddings=True)
+    assert target_data["ids"] == source_data["ids"]
+    np.testing.assert_array_equal(target_data["embeddings"], source_data["embeddings"])
+    for query in ("alpha", "motion", "light gamma"):
+        assert target.query("books", query, 3) == source.query("books", query, 3)
+
+
+def test_empty_collection_round_trip(tmp_path, embeddings):
+    source = make_store(tmp_path / "source", embeddings)
+    snapshot = tmp_path / "empty.parquet"
+    info = export_store_snapshot(source, "books", str(snapshot))
+    assert info["count"] == "0"
+
+    target = make_store(tmp_path / "target", embeddings)
+    assert import_store_snapshot(target, str(snapshot))["chunks"] == 0
+    assert target.count("books") == 0
+
+
+def test_corrupt_snapshot_is_rejected(tmp_path, embeddings):
+    source = make_store(tmp_path / "source", embeddings)
+    source.add("books", DOCUMENTS, METADATAS, IDS)
+    snapshot = tmp_path / "books.parquet"
+    export_store_snapshot(source, "books", str(snapshot))
+
+    table = pq.read_table(snapshot)
+    documents = table.column("document").to_pylist()
+    documents[0] = "tampered"
+    table = table.set_column(
+        table.schema.get_field_index("document"), "document", [documents]
+    ).replace_schema_metadata(table.schema.metadata)
+    pq.write_table(table, snapshot)
+
+    target = make_store(tmp_path / "target", embeddings)
+    with pytest.raises(SnapshotError):
+        import_store_snapshot(target, str(snapshot))
+    assert target.count("books") == 0
+
+
+def test_other_embedding_model_is_rejected(tmp_path, embeddings):
+    source = make_store(tmp_path / "source", embeddings)
+    source.add("books", DOCUMENTS, METADATAS, IDS)
+    snapshot = tmp_path / "books.parquet"
+    export_store_snapshot(source, "books", str(snapshot))
+
+    target = make_store(tmp_path / "target", embeddings)
+    target.embedding_model = "some/other-model"
+    with pytest.raises(SnapshotError):
+        import_store_snapshot(target, str(snapshot))
+
+
+def test_import_rows_without_metadata_into_sharded_store(tmp_path, embeddings):
+    source = make_store(tmp_path / "source", embeddings)
+    source.add("books", DOCUMENTS[:2], [{}, {}], IDS[:2])
+    snapshot = tmp_path / "books.parquet"
+    export_store_snapshot(source, "books", str(snapshot))
+
+    router = ShardRouter(
+        shards={"s1": str(tmp_path / "s1"), "s2": str(tmp_path / "s2")},
+        persist_dir=str(tmp_path / "router"),
+        backend="numpy",
+        embeddings=embeddings
+    )
+    assert import_store_snapshot(router, str(snapshot))["chunks"] == 2
+    assert router.count("books") == 2
+
+
+def test_regular_ingestion_normalizes_near_unit_vectors(tmp_path, embeddings):
+    store = make_store(tmp_path, embeddings)
+    store.add("books", ["x"], [{"source": "a.pdf"}], ["x"], embeddings=[[1.03, 0.0]])
+    stored = store.get_all("books", include_embeddings=True)["embeddings"]
+    np.testing.assert_allclose(stored, [[1.0, 0.0]])